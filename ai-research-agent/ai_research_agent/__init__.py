@@ -3,9 +3,9 @@ File: src/__init__.py
 Purpose: Main package initialization for the AI Research Agent
 Functionality: Exports core classes and provides package-level configuration
 Update Trigger: When package structure changes or new core exports are needed
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
-from .agent import ResearchAgent, research_agent
+from .agent import ResearchAgent, AgentPool, get_research_agent
 from .config import config
 from .models import (
     AgentState, ResearchPlan, ResearchStep, ResearchReport, 
@@ -18,7 +18,9 @@ __description__ = "Autonomous AI Research Agent with modular architecture"
 
 __all__ = [
     "ResearchAgent",
-    "research_agent", 
+    "AgentPool",
+    "research_agent",
+    "get_research_agent",
     "config",
     "AgentState",
     "ResearchPlan",
@@ -29,3 +31,9 @@ __all__ = [
     "MemoryEntry",
     "AgentContext"
 ]
+
+def __getattr__(name: str):
+    """Create the shared `research_agent` only when it is first accessed."""
+    if name == "research_agent":
+        return get_research_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,42 +3,91 @@ File: src/agent.py
 Purpose: Main research agent class that orchestrates the complete research workflow using FSM-based state management
 Functionality: Coordinates planning, execution, synthesis, and memory management with state-driven behavior
 Update Trigger: When agent behavior changes, new states are added, or workflow coordination is modified
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
-from typing import Any, Dict, List, Optional
-from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import cache
+from types import MappingProxyType
+import queue
 
 from .config import config
 from .models import AgentState, AgentContext, ResearchReport, ToolResult
-from .state_machine import state_machine
-from .components import ResearchPlanner, PlanExecutor, ResearchSynthesizer
-from .memory import MemoryManager
+from .state_machine import ResearchAgentStateMachine
+from .components import ResearchPlanner, PlanScheduler, PlanExecutor, ResearchSynthesizer
+from .memory import MemoryManager, LongTermMemory
 from .tools import tool_registry
 
+logger = logging.getLogger(__name__)
+
+# States from which a running research workflow can be paused
+_PAUSABLE_STATES = frozenset({AgentState.EXECUTING, AgentState.PLANNING, AgentState.SYNTHESIZING})
+
+# Fixed sections of the report returned when research fails
+_ERROR_REPORT_TEMPLATE = MappingProxyType({
+    "detailed_findings": "Unable to complete research due to system error.",
+    "conclusions": "Research could not be completed successfully.",
+    "methodology": "Research workflow interrupted by error",
+    "limitations": "Complete failure - no findings available"
+})
+_ERROR_REPORT_BASE_WORDS = sum(
+    len(_ERROR_REPORT_TEMPLATE[field].split()) for field in ("detailed_findings", "conclusions")
+)
+
 class ResearchAgent:
     """
     Autonomous AI Research Agent that performs deep, multi-step research.
     Uses finite state machine for predictable, observable behavior.
     """
     
-    def __init__(self):
+    __slots__ = (
+        "context",
+        "state_machine",
+        "planner",
+        "executor",
+        "synthesizer",
+        "memory",
+        "_tool_names",
+        "_ctx_cache",
+        "_pending_observations",
+        "_config_error",
+        "_last_paused_state",
+    )
+    
+    def __init__(self, long_term_memory: Optional[LongTermMemory] = None):
         # Initialize context and state
         self.context = AgentContext()
+        # Each agent owns its state machine so pooled agents never share transition history
+        self.state_machine = ResearchAgentStateMachine()
         
         # Initialize components
         self.planner = ResearchPlanner()
         self.executor = PlanExecutor()
         self.synthesizer = ResearchSynthesizer()
-        self.memory = MemoryManager()
+        self.memory = MemoryManager(long_term=long_term_memory)
         
-        # Validate configuration
-        try:
-            config.validate_required_keys()
-            print("Configuration validated successfully")
-        except ValueError as e:
-            print(f"Configuration warning: {e}")
+        # Tool set is fixed for a run; snapshot it instead of rebuilding per step
+        self._tool_names = tuple(tool_registry.get_tool_names())
+        
+        # (memory version, context window) for the last rendered snapshot
+        self._ctx_cache = (-1, "")
+        
+        # Step observations waiting to be written to memory in one batch
+        self._pending_observations: List[Tuple[str, ToolResult]] = []
         
-        print("ResearchAgent initialized successfully")
+        # State recorded by the last pause(), so repeated pauses are not re-logged
+        self._last_paused_state: Optional[AgentState] = None
+        
+        # Validate configuration (cached on the config object across agents)
+        self._config_error = config.required_keys_error
+        if self._config_error is None:
+            logger.info("Configuration validated successfully")
+        else:
+            logger.warning("Configuration warning: %s", self._config_error)
+        
+        logger.info("ResearchAgent initialized successfully")
         self._log_system_status()
     
     def research(self, query: str, strategy: str = "decomposition_first") -> ResearchReport:
@@ -52,8 +101,8 @@ class ResearchAgent:
         Returns:
             ResearchReport with findings, analysis, and citations
         """
-        print(f"\n🔬 Starting research: {query}")
-        print(f"Strategy: {strategy}")
+        logger.info("\n🔬 Starting research: %s", query)
+        logger.info("Strategy: %s", strategy)
         
         # Initialize research context
         self.context.query = query
@@ -63,138 +112,193 @@ class ResearchAgent:
             # Execute research workflow using state machine
             report = self._execute_research_workflow(strategy)
             
-            # Store final report in long-term memory
-            self.memory.store_research_report(report)
+            # Store final report in long-term memory (citations were stored during synthesis)
+            self.memory.store_research_report(report, include_citations=False)
             
-            print("✅ Research completed successfully")
+            logger.info("✅ Research completed successfully")
             return report
             
         except Exception as e:
+            self._flush_observations()
+            
             # Transition to error state
-            state_machine.transition(self.context, AgentState.ERROR, f"Research failed: {e}")
-            print(f"❌ Research failed: {e}")
+            self.state_machine.transition(self.context, AgentState.ERROR, f"Research failed: {e}")
+            logger.error("❌ Research failed: %s", e)
             
-            # Create error report
-            error_report = ResearchReport(
+            # Create error report from the static template, skipping validation
+            executive_summary = f"Research failed due to error: {str(e)}"
+            error_report = ResearchReport.model_construct(
                 query=query,
-                executive_summary=f"Research failed due to error: {str(e)}",
-                detailed_findings="Unable to complete research due to system error.",
-                conclusions="Research could not be completed successfully.",
+                executive_summary=executive_summary,
                 citations=[],
-                methodology="Research workflow interrupted by error",
-                limitations="Complete failure - no findings available"
+                word_count=len(executive_summary.split()) + _ERROR_REPORT_BASE_WORDS,
+                **_ERROR_REPORT_TEMPLATE
             )
             return error_report
+        
+        finally:
+            self.state_machine.flush_audit()
     
     def _execute_research_workflow(self, strategy: str) -> ResearchReport:
         """Execute the complete research workflow using state machine."""
         
         # State: PLANNING
-        state_machine.transition(self.context, AgentState.PLANNING, "Starting research planning")
+        self.state_machine.transition(self.context, AgentState.PLANNING, "Starting research planning")
         plan = self.planner.generate_plan(
             query=self.context.query,
             strategy=strategy,
-            context=self.memory.get_context_window(),
-            available_tools=tool_registry.get_tool_names()
+            context=self._context_window(),
+            available_tools=self._tool_names
         )
         
         self.context.plan = plan
         self.memory.update_plan(plan)
         
-        print(f"📋 Generated plan with {len(plan.steps)} steps")
-        print(self.planner.get_plan_summary(plan))
+        logger.info("📋 Generated plan with %d steps", len(plan.steps))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("%s", self.planner.get_plan_summary(plan))
         
         # State: EXECUTING
-        state_machine.transition(self.context, AgentState.EXECUTING, "Starting plan execution")
+        self.state_machine.transition(self.context, AgentState.EXECUTING, "Starting plan execution")
         
         execution_results = []
-        completed_step_numbers = []
+        scheduler = PlanScheduler(plan)
         
-        while True:
-            # Get next executable step
-            next_step = self.planner.get_next_executable_step(plan)
-            
-            if not next_step:
-                print("✅ All plan steps completed")
-                break
-            
-            # Validate dependencies
-            if not self.executor.validate_step_dependencies(next_step, completed_step_numbers):
-                print(f"⚠️ Dependencies not met for step {next_step.step_number}")
-                break
-            
-            # Update current step
-            self.context.current_step = next_step.step_number
-            
-            # Execute step
-            result = self.executor.execute_step(
-                step=next_step,
-                context=self.context,
-                available_tools=tool_registry.get_tool_names()
-            )
-            
-            # Record result
-            execution_results.append(result)
-            self.context.results.append(result)
-            
-            # Update step status
-            next_step.completed = result.success
-            next_step.result = result
-            
-            if result.success:
-                completed_step_numbers.append(next_step.step_number)
-                self.memory.add_observation(
-                    f"Completed step {next_step.step_number}: {next_step.task}",
-                    result
-                )
-            else:
-                self.memory.add_observation(
-                    f"Failed step {next_step.step_number}: {result.error_message}",
-                    result
-                )
+        with ThreadPoolExecutor(max_workers=config.MAX_PARALLEL_STEPS) as pool:
+            while True:
+                # Get every step whose dependencies are already satisfied
+                ready_steps = scheduler.pop_ready()
                 
-                # Check if we should replan
-                if self.planner.should_replan(next_step, str(result.result), self.memory.get_context_window()):
-                    state_machine.transition(self.context, AgentState.REPLANNING, "Replanning due to step failure")
+                if not ready_steps:
+                    logger.info("✅ All plan steps completed")
+                    break
+                
+                # Update current step
+                self.context.current_step = ready_steps[0].step_number
+                
+                # Execute independent steps concurrently; results are merged on this thread
+                futures = {
+                    pool.submit(
+                        self.executor.execute_step,
+                        step=step,
+                        context=self.context,
+                        available_tools=self._tool_names
+                    ): step
+                    for step in ready_steps
+                }
+                
+                replan_step = None
+                
+                # Merge in plan order so findings and citations don't depend on thread timing
+                for future, step in sorted(futures.items(), key=lambda item: item[1].step_number):
+                    result = future.result()
+                    
+                    # Record result
+                    execution_results.append(result)
+                    self.context.results.append(result)
+                    
+                    # Update step status
+                    step.completed = result.success
+                    step.result = result
+                    
+                    if result.success:
+                        scheduler.mark_done(step.step_number)
+                        self._queue_observation(
+                            f"Completed step {step.step_number}: {step.task}",
+                            result
+                        )
+                    else:
+                        scheduler.requeue(step.step_number)
+                        self._queue_observation(
+                            f"Failed step {step.step_number}: {result.error_message}",
+                            result
+                        )
+                        # The replan check below reads the context window, which must include this failure
+                        self._flush_observations()
+                        
+                        # Check if we should replan (from the earliest failed step)
+                        if replan_step is None or step.step_number < replan_step.step_number:
+                            needs_replan = self.planner.classify_failure(result.error_message)
+                            if needs_replan is None:
+                                needs_replan = self.planner.should_replan(
+                                    step, result.summary(), self._context_window()
+                                )
+                            if needs_replan:
+                                replan_step = step
+                
+                if replan_step is not None:
+                    self._flush_observations()
+                    self.state_machine.transition(self.context, AgentState.REPLANNING, "Replanning due to step failure")
                     
                     new_plan = self.planner.replan_from_step(
                         original_plan=plan,
-                        current_step_number=next_step.step_number,
-                        new_context=self.memory.get_context_window(),
-                        available_tools=tool_registry.get_tool_names()
+                        current_step_number=replan_step.step_number,
+                        new_context=self._context_window(),
+                        available_tools=self._tool_names
                     )
                     
                     self.context.plan = new_plan
                     plan = new_plan
+                    scheduler = PlanScheduler(plan)
                     self.memory.update_plan(new_plan)
                     
-                    print(f"🔄 Replanned from step {next_step.step_number}")
+                    logger.info("🔄 Replanned from step %d", replan_step.step_number)
                     
-                    state_machine.transition(self.context, AgentState.EXECUTING, "Resuming execution with new plan")
+                    self.state_machine.transition(self.context, AgentState.EXECUTING, "Resuming execution with new plan")
                     continue
-            
-            # Check for early termination
-            if self.executor.should_terminate_early(execution_results):
-                print("⚠️ Early termination due to excessive failures")
-                break
+                
+                # Check for early termination
+                if self.executor.should_terminate_early(execution_results):
+                    logger.warning("⚠️ Early termination due to excessive failures")
+                    break
         
         # State: SYNTHESIZING
-        state_machine.transition(self.context, AgentState.SYNTHESIZING, "Generating final report")
+        self._flush_observations()
+        self.state_machine.transition(self.context, AgentState.SYNTHESIZING, "Generating final report")
         
-        report = self.synthesizer.generate_report(
-            query=self.context.query,
-            research_results=execution_results,
-            context=self.memory.get_context_window(),
-            report_style="comprehensive"
-        )
+        # Persist citations on a background thread while report sections are generated
+        with ThreadPoolExecutor(max_workers=1) as writer:
+            citation_writes = []
+            report = self.synthesizer.generate_report(
+                query=self.context.query,
+                research_results=execution_results,
+                context=self._context_window(),
+                report_style="comprehensive",
+                on_citations=lambda citations: citation_writes.append(
+                    writer.submit(self.memory.store_citations, citations)
+                )
+            )
+            
+            # Re-raise any storage error here rather than losing it on the writer thread
+            for write in citation_writes:
+                write.result()
         
-        print(f"📄 Generated report with {report.word_count} words and {len(report.citations)} citations")
+        logger.info("📄 Generated report with %d words and %d citations", report.word_count, len(report.citations))
         
         # State: DONE
-        state_machine.transition(self.context, AgentState.DONE, "Research completed successfully")
+        self.state_machine.transition(self.context, AgentState.DONE, "Research completed successfully")
         
         return report
     
+    def _context_window(self) -> str:
+        """Return the memory context window, rebuilding it only after memory changes."""
+        version = self.memory.version
+        if self._ctx_cache[0] != version:
+            self._ctx_cache = (version, self.memory.get_context_window())
+        return self._ctx_cache[1]
+    
+    def _queue_observation(self, observation: str, result: ToolResult) -> None:
+        """Buffer a step observation, writing the batch once it is full."""
+        self._pending_observations.append((observation, result))
+        if len(self._pending_observations) >= config.OBSERVATION_BATCH_SIZE:
+            self._flush_observations()
+    
+    def _flush_observations(self) -> None:
+        """Write any buffered step observations to memory."""
+        if self._pending_observations:
+            self.memory.add_observations_bulk(self._pending_observations)
+            self._pending_observations = []
+    
     def get_status(self) -> Dict[str, Any]:
         """Get current agent status and statistics."""
         return {
@@ -203,8 +307,8 @@ class ResearchAgent:
             "current_step": self.context.current_step,
             "plan_progress": self.memory.short_term.get_plan_progress(),
             "memory_stats": self.memory.get_memory_stats(),
-            "tools_available": tool_registry.get_tool_names(),
-            "last_updated": self.context.last_updated.isoformat()
+            "tools_available": list(self._tool_names),
+            "last_updated": self.context.last_updated_iso
         }
     
     def get_execution_summary(self) -> Dict[str, Any]:
@@ -230,42 +334,48 @@ class ResearchAgent:
         """Clear current session data while preserving long-term memory."""
         self.context = AgentContext()
         self.memory.clear_short_term_memory(preserve_plan=False)
-        state_machine.reset()
-        print("Session cleared successfully")
+        self.state_machine.reset()
+        self._last_paused_state = None
+        logger.info("Session cleared successfully")
     
     def _log_system_status(self) -> None:
         """Log system status for debugging."""
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        
         status = {
-            "tools_initialized": len(tool_registry.get_tool_names()),
+            "tools_initialized": len(self._tool_names),
             "planner_has_llm": self.planner.llm is not None,
             "synthesizer_has_llm": self.synthesizer.llm is not None,
             "memory_backend": "pinecone" if hasattr(self.memory.long_term, 'initialized') and self.memory.long_term.initialized else "local",
-            "config_valid": True
+            "config_valid": self._config_error is None
         }
         
-        try:
-            config.validate_required_keys()
-        except ValueError:
-            status["config_valid"] = False
-        
-        print(f"System Status: {status}")
+        logger.debug("System Status: %r", status)
     
     def pause(self) -> bool:
         """Pause the current research process."""
-        if self.context.state in [AgentState.EXECUTING, AgentState.PLANNING, AgentState.SYNTHESIZING]:
-            # Save current state for resumption
-            self.memory.add_conversation_message("system", f"Research paused at state: {self.context.state}")
-            print(f"Research paused at state: {self.context.state}")
+        if self.context.state in _PAUSABLE_STATES:
+            if self.context.state != self._last_paused_state:
+                # Save current state for resumption
+                self.memory.add_conversation_message("system", f"Research paused at state: {self.context.state}")
+                logger.info("Research paused at state: %s", self.context.state)
+                self._last_paused_state = self.context.state
             return True
         return False
     
     def resume(self) -> bool:
         """Resume a paused research process."""
         if self.context.plan and self.context.state != AgentState.DONE:
-            print(f"Resuming research from state: {self.context.state}")
+            logger.info("Resuming research from state: %s", self.context.state)
+            self._last_paused_state = None
             return True
         return False
     
+    def invalidate_tool_cache(self) -> None:
+        """Refresh the cached tool names after tools are registered or removed."""
+        self._tool_names = tuple(tool_registry.get_tool_names())
+    
     def get_plan_summary(self) -> Optional[str]:
         """Get a summary of the current research plan."""
         if self.context.plan:
@@ -274,11 +384,58 @@ class ResearchAgent:
     
     def get_available_tools(self) -> List[str]:
         """Get list of available tools."""
-        return tool_registry.get_tool_names()
+        return list(self._tool_names)
     
     def get_tool_info(self, tool_name: str) -> Optional[Dict[str, Any]]:
         """Get information about a specific tool."""
         return tool_registry.get_tool_info(tool_name)
 
-# Create global agent instance for easy access
-research_agent = ResearchAgent()
+class AgentPool:
+    """
+    Fixed-size pool of pre-initialized ResearchAgent instances.
+    Avoids per-request component and LLM client setup when serving many queries.
+    All pooled agents share a single long-term memory store.
+    """
+    
+    __slots__ = ("size", "long_term_memory", "_agents")
+    
+    def __init__(self, size: Optional[int] = None):
+        self.size = size or config.AGENT_POOL_SIZE
+        self.long_term_memory = LongTermMemory()
+        self._agents: "queue.Queue[ResearchAgent]" = queue.Queue(maxsize=self.size)
+        
+        for _ in range(self.size):
+            self._agents.put(ResearchAgent(long_term_memory=self.long_term_memory))
+    
+    def acquire(self, timeout: Optional[float] = None) -> ResearchAgent:
+        """Take an agent from the pool, blocking until one is available."""
+        return self._agents.get(timeout=timeout)
+    
+    def release(self, agent: ResearchAgent) -> None:
+        """Reset an agent's session state and return it to the pool."""
+        agent.clear_session()
+        self._agents.put(agent)
+    
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[ResearchAgent]:
+        """Context manager that acquires an agent and always releases it."""
+        agent = self.acquire(timeout)
+        try:
+            yield agent
+        finally:
+            self.release(agent)
+    
+    def available(self) -> int:
+        """Number of agents currently idle in the pool."""
+        return self._agents.qsize()
+
+@cache
+def get_research_agent() -> ResearchAgent:
+    """Return the shared global agent, creating it on first use."""
+    return ResearchAgent()
+
+def __getattr__(name: str) -> Any:
+    """Resolve `research_agent` lazily so importing this module stays cheap."""
+    if name == "research_agent":
+        return get_research_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
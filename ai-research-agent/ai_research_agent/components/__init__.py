@@ -3,13 +3,13 @@ File: src/components/__init__.py
 Purpose: Components module initialization and unified interface for research agent components
 Functionality: Exports core components and provides orchestration interface for the research workflow
 Update Trigger: When new components are added or component interfaces change
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
-from .planner import ResearchPlanner
+from .planner import ResearchPlanner, PlanScheduler
 from .executor import PlanExecutor
 from .synthesis import ResearchSynthesizer
 
-__all__ = ["ResearchPlanner", "PlanExecutor", "ResearchSynthesizer", "ComponentOrchestrator"]
+__all__ = ["ResearchPlanner", "PlanScheduler", "PlanExecutor", "ResearchSynthesizer", "ComponentOrchestrator"]
 
 class ComponentOrchestrator:
     """
@@ -3,7 +3,7 @@ File: src/components/executor.py
 Purpose: Plan execution component that coordinates reasoning engines and tool usage for research steps
 Functionality: Executes research plan steps, manages reasoning strategy selection, and handles error recovery
 Update Trigger: When execution logic changes, new reasoning strategies are added, or error handling is improved
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
 from typing import Any, Dict, List, Optional
 from datetime import datetime
@@ -171,7 +171,9 @@ class PlanExecutor:
             context_parts.append("Recent Results:")
             for result in agent_context.results[-3:]:  # Last 3 results
                 if result.success:
-                    summary = str(result.result)[:200] + "..." if len(str(result.result)) > 200 else str(result.result)
+                    summary = result.summary(201)
+                    if len(summary) > 200:
+                        summary = summary[:200] + "..."
                     context_parts.append(f"- {result.tool_name}: {summary}")
         
         # Add reasoning history
@@ -3,23 +3,24 @@ File: src/components/planner.py
 Purpose: Task decomposition and research planning component for breaking down complex queries
 Functionality: Generates hierarchical research plans, estimates task complexity, and supports dynamic replanning
 Update Trigger: When planning strategies change, decomposition algorithms are updated, or plan formats are modified
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
+from collections import defaultdict, deque
 import json
+import re
 from datetime import datetime
 
-try:
-    from langchain_openai import ChatOpenAI
-    from langchain_core.prompts import ChatPromptTemplate
-    LANGCHAIN_AVAILABLE = True
-except ImportError:
-    LANGCHAIN_AVAILABLE = False
-
 from ..config import config
+from ..llm_client import LANGCHAIN_AVAILABLE, get_llm
 from ..models import ResearchPlan, ResearchStep, ReasoningStrategy
 from ..tools import tool_registry
 
+# Failure signatures that can be classified without inspecting the observation.
+# Transient errors are retried as-is; structural errors always need a new plan.
+TRANSIENT_FAILURE_PATTERN = re.compile(r"rate[ _-]?limit|\b429\b|time[ _-]?out|timed out|connection", re.IGNORECASE)
+STRUCTURAL_FAILURE_PATTERN = re.compile(r"tool_not_found|tool '[^']*' not found|invalid[ _]argument", re.IGNORECASE)
+
 class ResearchPlanner:
     """
     Generates research plans by decomposing complex queries into manageable steps.
@@ -33,11 +34,8 @@ class ResearchPlanner:
         
         if LANGCHAIN_AVAILABLE and config.OPENAI_API_KEY:
             try:
-                self.llm = ChatOpenAI(
-                    model=self.model_name,
-                    api_key=config.OPENAI_API_KEY,
-                    temperature=0.2  # Low temperature for consistent planning
-                )
+                # Low temperature for consistent planning
+                self.llm = get_llm("planner", temperature=0.2)
             except Exception as e:
                 print(f"Warning: Could not initialize LLM for planner: {e}")
         else:
@@ -305,6 +303,20 @@ Research Plan:"""
         
         return int(total_minutes)
     
+    def classify_failure(self, error_message: Optional[str]) -> Optional[bool]:
+        """
+        Cheaply decide whether a failed step needs replanning from its error message.
+        Returns False for transient errors (retry the step), True for structural
+        errors, or None when the error is ambiguous and should_replan should decide.
+        """
+        if not error_message:
+            return None
+        if TRANSIENT_FAILURE_PATTERN.search(error_message):
+            return False
+        if STRUCTURAL_FAILURE_PATTERN.search(error_message):
+            return True
+        return None
+    
     def should_replan(self, current_step: ResearchStep, observation: str, context: str) -> bool:
         """
         Determine if the current plan should be modified based on new observations.
@@ -409,3 +421,51 @@ Research Plan:"""
             summary += f"{status} Step {step.step_number}: {step.task}{deps}\n"
         
         return summary
+
+
+class PlanScheduler:
+    """
+    Tracks which steps of a plan are ready to run.
+    The dependency graph is built once per plan; completing a step only touches
+    the steps that depend on it instead of rescanning the whole plan.
+    """
+    
+    def __init__(self, plan: ResearchPlan):
+        completed = {step.step_number for step in plan.steps if step.completed}
+        
+        self._steps: Dict[int, ResearchStep] = {}
+        self._pending: Dict[int, Set[int]] = {}
+        self._dependents: Dict[int, Set[int]] = defaultdict(set)
+        self._ready: deque = deque()
+        
+        for step in plan.steps:
+            if step.completed:
+                continue
+            
+            self._steps[step.step_number] = step
+            # Dependencies that never complete (or are missing) keep the step blocked
+            pending = {dep for dep in step.dependencies if dep not in completed}
+            self._pending[step.step_number] = pending
+            for dep in pending:
+                self._dependents[dep].add(step.step_number)
+            
+            if not pending:
+                self._ready.append(step.step_number)
+    
+    def pop_ready(self) -> List[ResearchStep]:
+        """Remove and return every step whose dependencies are satisfied."""
+        ready = [self._steps[step_number] for step_number in self._ready]
+        self._ready.clear()
+        return ready
+    
+    def mark_done(self, step_number: int) -> None:
+        """Record a completed step and release any dependents it was blocking."""
+        for dependent in self._dependents.pop(step_number, ()):
+            pending = self._pending[dependent]
+            pending.discard(step_number)
+            if not pending:
+                self._ready.append(dependent)
+    
+    def requeue(self, step_number: int) -> None:
+        """Put a failed step back so it is dispatched again."""
+        self._ready.append(step_number)
@@ -3,50 +3,161 @@ File: src/components/synthesis.py
 Purpose: Research synthesis and report generation component for combining findings into comprehensive reports
 Functionality: Synthesizes research results, generates structured reports, manages citations, and ensures quality
 Update Trigger: When report formats change, synthesis algorithms are updated, or citation standards are modified
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from io import StringIO
+from itertools import islice
 import re
 
-try:
-    from langchain_openai import ChatOpenAI
-    from langchain_core.prompts import ChatPromptTemplate
-    LANGCHAIN_AVAILABLE = True
-except ImportError:
-    LANGCHAIN_AVAILABLE = False
-
 from ..config import config
+from ..llm_client import get_llm
 from ..models import ResearchReport, Citation, ToolResult
 
+ACCESSED_DATE_FORMAT = "%Y-%m-%d"
+
+# Section prompts: a shared system prefix (identical across sections so providers can
+# cache it) followed by a fixed per-section instruction
+_SHARED_PREFIX_TEMPLATE = """You are writing sections of a research report from the material below.
+
+Research Query: {query}
+Context: {context}
+
+Research Findings:
+{findings}
+
+Available Citations:
+{citations}"""
+
+_EXECUTIVE_SUMMARY_INSTRUCTION = """Write a concise executive summary for the research report.
+
+Write a 3-4 paragraph executive summary that:
+1. States the research objective clearly
+2. Summarizes the key findings
+3. Highlights the most important insights
+4. Provides a brief overview of implications
+
+Executive Summary:"""
+
+_DETAILED_FINDINGS_INSTRUCTION = """Write a detailed findings section for the research report.
+
+Write a comprehensive findings section that:
+1. Organizes information by themes or categories
+2. Presents evidence systematically
+3. References sources appropriately
+4. Maintains objectivity
+5. Includes specific details and examples
+
+Detailed Findings:"""
+
+_CONCLUSIONS_INSTRUCTION = """Write a conclusions section for the research report.
+
+Write a conclusions section that:
+1. Synthesizes the key findings
+2. Addresses the original research question
+3. Identifies patterns and trends
+4. Discusses implications
+5. Suggests areas for further investigation
+
+Conclusions:"""
+
+@lru_cache(maxsize=4)
+def _render_findings(sections: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> str:
+    """Render (category, findings) pairs as LLM prompt text; cached so retries reuse it."""
+    buf = StringIO()
+    
+    for category, finding_list in sections:
+        if buf.tell():
+            buf.write("\n")
+        buf.write(f"## {category.replace('_', ' ').title()}\n")
+        for i, finding in enumerate(finding_list, 1):
+            # Truncate very long findings
+            buf.write(f"{i}. {finding[:1000]}")
+            if len(finding) > 1000:
+                buf.write("...")
+            buf.write("\n")
+    
+    return buf.getvalue()
+
+def _web_search_citations(result: Dict[str, Any], accessed_date: datetime) -> List[Citation]:
+    """Build citations from a web search result."""
+    return [
+        Citation(
+            source_url=citation_data.get("source_url"),
+            title=citation_data.get("title", "Unknown Title"),
+            author=citation_data.get("author"),
+            publication_date=None,  # Would need date parsing
+            accessed_date=accessed_date,
+            snippet=citation_data.get("snippet", ""),
+            relevance_score=citation_data.get("relevance_score", 0.5)
+        )
+        for citation_data in result.get("citations", [])
+        if isinstance(citation_data, dict)
+    ]
+
+def _pdf_citations(result: Dict[str, Any], accessed_date: datetime) -> List[Citation]:
+    """Build the document citation from a PDF parser result."""
+    citation_data = result.get("citation", {})
+    if not citation_data:
+        return []
+    return [
+        Citation(
+            source_url=citation_data.get("source_url"),
+            title=citation_data.get("title", "PDF Document"),
+            author=citation_data.get("author"),
+            publication_date=None,  # Would need date parsing
+            accessed_date=accessed_date,
+            snippet="PDF document analysis",
+            relevance_score=0.8
+        )
+    ]
+
 class ResearchSynthesizer:
     """
     Synthesizes research findings into comprehensive reports.
     Handles citation management, content organization, and quality assurance.
     """
     
+    # Findings bucket for each tool; other tools go to "general_findings"
+    _TOOL_BUCKETS = {
+        "web_search": "web_search_results",
+        "pdf_parser": "pdf_analysis",
+        "data_analyzer": "data_analysis"
+    }
+    
+    # Citation extractors for tools whose results carry source information
+    _CITATION_EXTRACTORS: Dict[str, Callable[[Dict[str, Any], datetime], List[Citation]]] = {
+        "web_search": _web_search_citations,
+        "pdf_parser": _pdf_citations
+    }
+    
     def __init__(self):
         self.model_name = config.get_model_config("synthesis")
         self.llm = None
         
-        if LANGCHAIN_AVAILABLE and config.OPENAI_API_KEY:
-            try:
-                self.llm = ChatOpenAI(
-                    model=self.model_name,
-                    api_key=config.OPENAI_API_KEY,
-                    temperature=0.3  # Moderate temperature for creative synthesis
-                )
-            except Exception as e:
-                print(f"Warning: Could not initialize LLM for synthesis: {e}")
-        else:
+        if not config.OPENAI_API_KEY:
             print("Warning: LangChain not available. Synthesizer will use template-based generation.")
+            return
+        
+        # get_llm imports LangChain on first use, so template-only runs never load it
+        try:
+            # Moderate temperature for creative synthesis
+            self.llm = get_llm("synthesis", temperature=0.3)
+        except ImportError:
+            print("Warning: LangChain not available. Synthesizer will use template-based generation.")
+        except Exception as e:
+            print(f"Warning: Could not initialize LLM for synthesis: {e}")
     
     def generate_report(
         self,
         query: str,
         research_results: List[ToolResult],
         context: str = "",
-        report_style: str = "comprehensive"
+        report_style: str = "comprehensive",
+        on_citations: Optional[Callable[[List[Citation]], None]] = None
     ) -> ResearchReport:
         """
         Generate a comprehensive research report from collected findings.
@@ -56,6 +167,9 @@ class ResearchSynthesizer:
             research_results: List of tool results from research steps
             context: Additional context for synthesis
             report_style: Style of report ("comprehensive", "executive", "academic")
+            on_citations: Optional callback invoked with the extracted citations
+                before report sections are generated, so callers can persist
+                them while the (slow) section generation runs
         """
         # Extract and organize findings
         organized_findings = self._organize_findings(research_results)
@@ -63,6 +177,9 @@ class ResearchSynthesizer:
         # Extract citations
         citations = self._extract_citations(research_results)
         
+        if on_citations:
+            on_citations(citations)
+        
         # Generate report sections
         if self.llm:
             report_sections = self._generate_report_with_llm(
@@ -100,71 +217,37 @@ class ResearchSynthesizer:
             if not result.success:
                 organized["errors"].append(f"Error from {result.tool_name}: {result.error_message}")
                 continue
-                
-            content = str(result.result)
             
-            if result.tool_name == "web_search":
-                organized["web_search_results"].append(content)
-            elif result.tool_name == "pdf_parser":
-                organized["pdf_analysis"].append(content)
-            elif result.tool_name == "data_analyzer":
-                organized["data_analysis"].append(content)
-            else:
-                organized["general_findings"].append(content)
+            bucket = self._TOOL_BUCKETS.get(result.tool_name, "general_findings")
+            organized[bucket].append(result.as_text())
         
         return organized
     
     def _extract_citations(self, research_results: List[ToolResult]) -> List[Citation]:
         """Extract citations from research results."""
+        # One access time for the whole extraction
+        accessed_date = datetime.now()
         citations = []
         
         for result in research_results:
-            if not result.success:
+            if not result.success or not isinstance(result.result, dict):
                 continue
-                
-            # Handle web search results with citations
-            if result.tool_name == "web_search" and isinstance(result.result, dict):
-                result_citations = result.result.get("citations", [])
-                for citation_data in result_citations:
-                    if isinstance(citation_data, dict):
-                        citation = Citation(
-                            source_url=citation_data.get("source_url"),
-                            title=citation_data.get("title", "Unknown Title"),
-                            author=citation_data.get("author"),
-                            publication_date=None,  # Would need date parsing
-                            accessed_date=datetime.now(),
-                            snippet=citation_data.get("snippet", ""),
-                            relevance_score=citation_data.get("relevance_score", 0.5)
-                        )
-                        citations.append(citation)
             
-            # Handle PDF citations
-            elif result.tool_name == "pdf_parser" and isinstance(result.result, dict):
-                citation_data = result.result.get("citation", {})
-                if citation_data:
-                    citation = Citation(
-                        source_url=citation_data.get("source_url"),
-                        title=citation_data.get("title", "PDF Document"),
-                        author=citation_data.get("author"),
-                        publication_date=None,  # Would need date parsing
-                        accessed_date=datetime.now(),
-                        snippet="PDF document analysis",
-                        relevance_score=0.8
-                    )
-                    citations.append(citation)
-        
-        # Remove duplicates based on URL or title
+            extractor = self._CITATION_EXTRACTORS.get(result.tool_name)
+            if extractor:
+                citations.extend(extractor(result.result, accessed_date))
+        
+        # Remove duplicates, keyed on the URL or (for URL-less sources) the normalized title.
+        # Only the 64-bit hash of each key is kept, so normalized titles are not retained.
         unique_citations = []
-        seen_urls = set()
-        seen_titles = set()
+        seen = set()
         
         for citation in citations:
-            identifier = citation.source_url or citation.title
-            if identifier not in seen_urls and citation.title not in seen_titles:
-                unique_citations.append(citation)
-                if citation.source_url:
-                    seen_urls.add(citation.source_url)
-                seen_titles.add(citation.title)
+            key = hash(citation.source_url or citation.title.strip().lower())
+            if key in seen:
+                continue
+            seen.add(key)
+            unique_citations.append(citation)
         
         return unique_citations
     
@@ -182,22 +265,21 @@ class ResearchSynthesizer:
             findings_text = self._format_findings_for_llm(findings)
             citations_text = self._format_citations_for_llm(citations)
             
-            sections = {}
+            # Shared by all section prompts so the provider can cache it
+            shared_prefix = self._build_shared_prefix(query, findings_text, citations_text, context)
             
-            # Generate executive summary
-            sections["executive_summary"] = self._generate_executive_summary(
-                query, findings_text, context
-            )
-            
-            # Generate detailed findings
-            sections["detailed_findings"] = self._generate_detailed_findings(
-                query, findings_text, citations_text, context
-            )
-            
-            # Generate conclusions
-            sections["conclusions"] = self._generate_conclusions(
-                query, findings_text, context
-            )
+            # The three LLM sections are independent, so request them concurrently.
+            # Each one falls back to its own template text if its call fails.
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                summary_future = pool.submit(self._generate_executive_summary, query, shared_prefix)
+                findings_future = pool.submit(self._generate_detailed_findings, shared_prefix)
+                conclusions_future = pool.submit(self._generate_conclusions, shared_prefix)
+                
+                sections = {
+                    "executive_summary": summary_future.result(),
+                    "detailed_findings": findings_future.result(),
+                    "conclusions": conclusions_future.result()
+                }
             
             # Generate methodology
             sections["methodology"] = self._generate_methodology(findings)
@@ -222,9 +304,10 @@ class ResearchSynthesizer:
         sections = {}
         
         # Count findings
-        total_findings = sum(len(finding_list) for finding_list in findings.values())
-        web_results = len(findings.get("web_search_results", []))
-        pdf_results = len(findings.get("pdf_analysis", []))
+        counts = {category: len(finding_list) for category, finding_list in findings.items()}
+        total_findings = sum(counts.values())
+        web_results = counts.get("web_search_results", 0)
+        pdf_results = counts.get("pdf_analysis", 0)
         
         sections["executive_summary"] = f"""
 This research investigated: {query}
@@ -236,10 +319,10 @@ The research provides insights into current trends, established practices, and e
         
         sections["detailed_findings"] = f"""
 ## Web Search Results
-{len(findings.get('web_search_results', []))} web sources were analyzed, providing current information and diverse perspectives on the topic.
+{web_results} web sources were analyzed, providing current information and diverse perspectives on the topic.
 
 ## Document Analysis  
-{len(findings.get('pdf_analysis', []))} documents were analyzed for detailed technical information and established research.
+{pdf_results} documents were analyzed for detailed technical information and established research.
 
 ## Key Insights
 The research reveals multiple facets of {query}, with evidence supporting various approaches and considerations.
@@ -270,18 +353,13 @@ Total sources analyzed: {total_findings}
     
     def _format_findings_for_llm(self, findings: Dict[str, List[str]]) -> str:
         """Format findings for LLM consumption."""
-        formatted = []
-        
-        for category, finding_list in findings.items():
-            if finding_list and category != "errors":
-                formatted.append(f"## {category.replace('_', ' ').title()}")
-                for i, finding in enumerate(finding_list[:3], 1):  # Limit to prevent token overflow
-                    # Truncate very long findings
-                    truncated_finding = finding[:1000] + "..." if len(finding) > 1000 else finding
-                    formatted.append(f"{i}. {truncated_finding}")
-                formatted.append("")
-        
-        return "\n".join(formatted)
+        # Only the first three findings per category are rendered, so they form the cache key
+        sections = tuple(
+            (category, tuple(islice(finding_list, 3)))  # Limit to prevent token overflow
+            for category, finding_list in findings.items()
+            if finding_list and category != "errors"
+        )
+        return _render_findings(sections)
     
     def _format_citations_for_llm(self, citations: List[Citation]) -> str:
         """Format citations for LLM consumption."""
@@ -289,92 +367,49 @@ Total sources analyzed: {total_findings}
             return "No specific citations available."
         
         formatted = ["## Available Citations"]
-        for i, citation in enumerate(citations[:10], 1):  # Limit citations
-            citation_text = f"{i}. {citation.title}"
-            if citation.author:
-                citation_text += f" by {citation.author}"
-            if citation.source_url:
-                citation_text += f" ({citation.source_url})"
-            formatted.append(citation_text)
+        formatted.extend(
+            f"{i}. {citation.title}"
+            f"{f' by {citation.author}' if citation.author else ''}"
+            f"{f' ({citation.source_url})' if citation.source_url else ''}"
+            for i, citation in enumerate(islice(citations, 10), 1)  # Limit citations
+        )
         
         return "\n".join(formatted)
     
-    def _generate_executive_summary(self, query: str, findings: str, context: str) -> str:
+    def _build_shared_prefix(self, query: str, findings: str, citations: str, context: str) -> str:
+        """
+        Build the system message shared by every section prompt.
+        It must stay byte-identical across the section calls for prompt caching to apply.
+        """
+        return _SHARED_PREFIX_TEMPLATE.format(
+            query=query, context=context, findings=findings, citations=citations
+        )
+    
+    def _invoke_section(self, shared_prefix: str, instruction: str) -> str:
+        """Run one section prompt: the shared prefix as system message, the instruction last."""
+        response = self.llm.invoke([("system", shared_prefix), ("human", instruction)])
+        return response.content.strip()
+    
+    def _generate_executive_summary(self, query: str, shared_prefix: str) -> str:
         """Generate executive summary using LLM."""
-        prompt = f"""Write a concise executive summary for a research report.
-
-Research Query: {query}
-Context: {context}
-
-Research Findings:
-{findings}
-
-Write a 3-4 paragraph executive summary that:
-1. States the research objective clearly
-2. Summarizes the key findings
-3. Highlights the most important insights
-4. Provides a brief overview of implications
-
-Executive Summary:"""
-        
         try:
-            response = self.llm.invoke(prompt)
-            return response.content.strip()
+            return self._invoke_section(shared_prefix, _EXECUTIVE_SUMMARY_INSTRUCTION)
         except Exception as e:
             print(f"Error generating executive summary: {e}")
             return f"Research was conducted on: {query}. Multiple sources were analyzed to provide comprehensive insights."
     
-    def _generate_detailed_findings(self, query: str, findings: str, citations: str, context: str) -> str:
+    def _generate_detailed_findings(self, shared_prefix: str) -> str:
         """Generate detailed findings section using LLM."""
-        prompt = f"""Write a detailed findings section for a research report.
-
-Research Query: {query}
-Context: {context}
-
-Research Findings:
-{findings}
-
-Available Citations:
-{citations}
-
-Write a comprehensive findings section that:
-1. Organizes information by themes or categories
-2. Presents evidence systematically
-3. References sources appropriately
-4. Maintains objectivity
-5. Includes specific details and examples
-
-Detailed Findings:"""
-        
         try:
-            response = self.llm.invoke(prompt)
-            return response.content.strip()
+            return self._invoke_section(shared_prefix, _DETAILED_FINDINGS_INSTRUCTION)
         except Exception as e:
             print(f"Error generating detailed findings: {e}")
             return "Detailed analysis of research findings reveals multiple perspectives and comprehensive information on the topic."
     
-    def _generate_conclusions(self, query: str, findings: str, context: str) -> str:
+    def _generate_conclusions(self, shared_prefix: str) -> str:
         """Generate conclusions section using LLM."""
-        prompt = f"""Write a conclusions section for a research report.
-
-Research Query: {query}
-Context: {context}
-
-Research Findings:
-{findings}
-
-Write a conclusions section that:
-1. Synthesizes the key findings
-2. Addresses the original research question
-3. Identifies patterns and trends
-4. Discusses implications
-5. Suggests areas for further investigation
-
-Conclusions:"""
-        
         try:
-            response = self.llm.invoke(prompt)
-            return response.content.strip()
+            return self._invoke_section(shared_prefix, _CONCLUSIONS_INSTRUCTION)
         except Exception as e:
             print(f"Error generating conclusions: {e}")
             return "The research provides valuable insights into the topic and establishes a foundation for further investigation."
@@ -444,68 +479,71 @@ Conclusions:"""
     
     def _export_markdown(self, report: ResearchReport) -> str:
         """Export report as Markdown."""
-        markdown = f"""# Research Report: {report.query}
-
-*Generated on {report.generated_at.strftime('%Y-%m-%d %H:%M:%S')}*
-
-## Executive Summary
-
-{report.executive_summary}
-
-## Detailed Findings
-
-{report.detailed_findings}
-
-## Conclusions
-
-{report.conclusions}
-
-## Methodology
-
-{report.methodology}
-"""
+        parts = [
+            f"# Research Report: {report.query}",
+            "",
+            f"*Generated on {report.generated_at.strftime('%Y-%m-%d %H:%M:%S')}*",
+            "",
+            "## Executive Summary",
+            "",
+            report.executive_summary,
+            "",
+            "## Detailed Findings",
+            "",
+            report.detailed_findings,
+            "",
+            "## Conclusions",
+            "",
+            report.conclusions,
+            "",
+            "## Methodology",
+            "",
+            report.methodology
+        ]
         
         if report.limitations:
-            markdown += f"\n## Limitations\n\n{report.limitations}\n"
+            parts.extend(["", "## Limitations", "", report.limitations])
         
         if report.citations:
-            markdown += "\n## References\n\n"
-            for i, citation in enumerate(report.citations, 1):
-                citation_text = f"{i}. {citation.title}"
-                if citation.author:
-                    citation_text += f" by {citation.author}"
-                if citation.source_url:
-                    citation_text += f" - {citation.source_url}"
-                citation_text += f" (Accessed: {citation.accessed_date.strftime('%Y-%m-%d')})"
-                markdown += citation_text + "\n"
-        
-        return markdown
+            parts.extend(["", "## References", ""])
+            parts.extend(
+                self._format_citation_markdown(i, citation)
+                for i, citation in enumerate(report.citations, 1)
+            )
+        
+        parts.append("")
+        return "\n".join(parts)
+    
+    @staticmethod
+    def _format_citation_markdown(index: int, citation: Citation) -> str:
+        """Format one numbered Markdown reference line."""
+        author_part = f" by {citation.author}" if citation.author else ""
+        url_part = f" - {citation.source_url}" if citation.source_url else ""
+        return (
+            f"{index}. {citation.title}{author_part}{url_part} "
+            f"(Accessed: {citation.accessed_date.strftime(ACCESSED_DATE_FORMAT)})"
+        )
     
     def _export_text(self, report: ResearchReport) -> str:
         """Export report as plain text."""
-        text = f"RESEARCH REPORT: {report.query.upper()}\n"
-        text += f"Generated: {report.generated_at.strftime('%Y-%m-%d %H:%M:%S')}\n"
-        text += "=" * 60 + "\n\n"
-        
-        text += "EXECUTIVE SUMMARY\n" + "-" * 20 + "\n"
-        text += report.executive_summary + "\n\n"
-        
-        text += "DETAILED FINDINGS\n" + "-" * 20 + "\n"
-        text += report.detailed_findings + "\n\n"
-        
-        text += "CONCLUSIONS\n" + "-" * 20 + "\n"
-        text += report.conclusions + "\n\n"
-        
-        text += "METHODOLOGY\n" + "-" * 20 + "\n"
-        text += report.methodology + "\n\n"
+        rule = "-" * 20
+        parts = [
+            f"RESEARCH REPORT: {report.query.upper()}",
+            f"Generated: {report.generated_at.strftime('%Y-%m-%d %H:%M:%S')}",
+            "=" * 60,
+            "",
+            "EXECUTIVE SUMMARY", rule, report.executive_summary, "",
+            "DETAILED FINDINGS", rule, report.detailed_findings, "",
+            "CONCLUSIONS", rule, report.conclusions, "",
+            "METHODOLOGY", rule, report.methodology, ""
+        ]
         
         if report.limitations:
-            text += "LIMITATIONS\n" + "-" * 20 + "\n"
-            text += report.limitations + "\n\n"
+            parts.extend(["LIMITATIONS", rule, report.limitations, ""])
         
         if report.citations:
-            text += "REFERENCES\n" + "-" * 20 + "\n"
-            for i, citation in enumerate(report.citations, 1):
-                text += f"{i}. {citation.title}\n"
+            parts.extend(["REFERENCES", rule])
+            parts.extend(f"{i}. {citation.title}" for i, citation in enumerate(report.citations, 1))
         
-        return text
+        parts.append("")
+        return "\n".join(parts)
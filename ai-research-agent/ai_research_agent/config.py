@@ -3,9 +3,10 @@ File: src/config.py
 Purpose: Configuration management for API keys, model settings, and application constants
 Functionality: Loads environment variables, defines model configurations, and provides centralized settings management
 Update Trigger: When new API services are added, model configurations change, or environment setup requirements are modified
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
 import os
+from functools import cached_property
 from typing import Optional
 from dotenv import load_dotenv
 
@@ -27,21 +28,34 @@ class Config:
     SYNTHESIS_MODEL: str = "gpt-4.1-mini-2025-04-14"
     REASONING_MODEL: str = "gpt-4.1-mini-2025-04-14"
     
+    # LLM connection pool shared by all components
+    LLM_MAX_CONNECTIONS: int = 32
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 16
+    
     # Vector DB configuration
     PINECONE_INDEX_NAME: str = "research-agent-ltm"
+    EMBEDDING_MODEL: str = "text-embedding-ada-002"
     PINECONE_ENVIRONMENT: str = os.getenv("PINECONE_ENVIRONMENT", "us-east-1")
     
     # Memory settings
     MAX_SHORT_TERM_MEMORY: int = 10
     MAX_CONTEXT_WINDOW: int = 8000
+    OBSERVATION_BATCH_SIZE: int = 5
     
     # Agent behavior settings
     MAX_PLAN_STEPS: int = 10
+    MAX_PARALLEL_STEPS: int = 3
     MAX_REASONING_ITERATIONS: int = 5
+    MAX_TRANSITION_HISTORY: int = 1024
+    TOT_MAX_CONCURRENCY: int = 4
+    TOT_PROMPT_CACHE_SIZE: int = 1024
     REPLANNING_THRESHOLD: float = 0.3
+    AGENT_POOL_SIZE: int = 2
     
     # Tool settings
     WEB_SEARCH_MAX_RESULTS: int = 5
+    WEB_SEARCH_MAX_CONCURRENCY: int = 4
+    TOOL_MAX_CONCURRENCY: int = 4
     PDF_MAX_PAGES: int = 50
     
     @classmethod
@@ -61,6 +75,15 @@ class Config:
         
         return True
     
+    @cached_property
+    def required_keys_error(self) -> Optional[str]:
+        """Result of validate_required_keys() computed once: None if valid, else the error."""
+        try:
+            self.validate_required_keys()
+        except ValueError as e:
+            return str(e)
+        return None
+    
     @classmethod
     def get_model_config(cls, component: str) -> str:
         """Get the model configuration for a specific component."""
@@ -0,0 +1,42 @@
+"""
+File: src/llm_client.py
+Purpose: Shared LLM client factory so every component reuses one HTTP connection pool
+Functionality: Builds and caches ChatOpenAI clients per component role and temperature on top of a single httpx client
+Update Trigger: When LLM providers change, connection pool settings are tuned, or new components need LLM access
+Last Modified: 2026-10-16
+"""
+from functools import lru_cache
+from typing import Any
+import importlib.util
+
+from .config import config
+
+# Checked without importing: langchain_openai is only loaded once a client is actually built
+LANGCHAIN_AVAILABLE = importlib.util.find_spec("langchain_openai") is not None
+
+@lru_cache(maxsize=None)
+def get_http_client() -> Any:
+    """Return the process-wide httpx client used for all LLM requests."""
+    import httpx
+    
+    return httpx.Client(
+        limits=httpx.Limits(
+            max_connections=config.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=config.LLM_MAX_KEEPALIVE_CONNECTIONS
+        )
+    )
+
+@lru_cache(maxsize=None)
+def get_llm(role: str, temperature: float) -> Any:
+    """
+    Return the shared chat client for a component role.
+    Raises ImportError if langchain_openai is not installed.
+    """
+    from langchain_openai import ChatOpenAI
+    
+    return ChatOpenAI(
+        model=config.get_model_config(role),
+        api_key=config.OPENAI_API_KEY,
+        temperature=temperature,
+        http_client=get_http_client()
+    )
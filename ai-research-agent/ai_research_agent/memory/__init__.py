@@ -3,8 +3,10 @@ File: src/memory/__init__.py
 Purpose: Memory module initialization and unified memory management interface
 Functionality: Exports memory classes and provides unified memory management for the research agent
 Update Trigger: When memory system architecture changes or new memory types are added
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
+from typing import Optional
+
 from .short_term import ShortTermMemory
 from .long_term import LongTermMemory
 
@@ -16,10 +18,16 @@ class MemoryManager:
     Provides a single entry point for all memory operations.
     """
     
-    def __init__(self):
+    def __init__(self, long_term: Optional[LongTermMemory] = None):
         self.short_term = ShortTermMemory()
-        self.long_term = LongTermMemory()
+        # Long-term memory may be shared between managers (e.g. pooled agents)
+        self.long_term = long_term or LongTermMemory()
         
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever short-term memory is modified."""
+        return self.short_term.version
+    
     def add_conversation_message(self, role: str, message: str) -> str:
         """Add a conversation message to short-term memory."""
         return self.short_term.add_conversation_message(role, message)
@@ -28,6 +36,10 @@ class MemoryManager:
         """Add an observation to short-term memory."""
         return self.short_term.add_observation(observation, tool_result)
     
+    def add_observations_bulk(self, observations) -> list:
+        """Add several (observation, tool_result) pairs to short-term memory at once."""
+        return self.short_term.add_observations(observations)
+    
     def add_reasoning_step(self, thought: str, action: str, reasoning_type: str = "react") -> str:
         """Add a reasoning step to short-term memory."""
         return self.short_term.add_reasoning_step(thought, action, reasoning_type)
@@ -44,13 +56,17 @@ class MemoryManager:
         """Store a research finding in long-term memory."""
         return self.long_term.store_research_finding(content, metadata, embedding)
     
-    def store_citation(self, citation) -> str:
+    def store_citation(self, citation, embedding=None) -> str:
         """Store a citation in long-term memory."""
-        return self.long_term.store_citation(citation)
+        return self.long_term.store_citation(citation, embedding)
+    
+    def store_citations(self, citations) -> list:
+        """Store several citations in long-term memory (one embeddings request)."""
+        return self.long_term.store_citations(citations)
     
-    def store_research_report(self, report) -> str:
-        """Store a complete research report in long-term memory."""
-        return self.long_term.store_research_report(report)
+    def store_research_report(self, report, include_citations: bool = True) -> str:
+        """Store a report and (optionally) its citations, embedded in one request."""
+        return self.long_term.store_research_report(report, include_citations)
     
     def search_long_term_memory(self, query: str, memory_type=None, limit: int = 5):
         """Search long-term memory for relevant content."""
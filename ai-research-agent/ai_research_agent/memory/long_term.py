@@ -3,7 +3,7 @@ File: src/memory/long_term.py
 Purpose: Long-term persistent memory management using vector database for semantic storage and retrieval
 Functionality: Stores and retrieves research findings, maintains episodic memory, and provides semantic search capabilities
 Update Trigger: When vector database integration changes, embedding models are updated, or memory retrieval strategies are modified
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
 from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
@@ -31,7 +31,10 @@ class LongTermMemory:
         self.pc: Optional[Any] = None
         self.index: Optional[Any] = None
         self.embedding_dimension = 1536  # OpenAI text-embedding-ada-002 dimension
+        self.embeddings: Optional[Any] = None
         self.initialized = False
+        # Created up front (not lazily) since one instance may be shared by pooled agents
+        self.local_memory: Dict[str, Any] = {}
         
         if PINECONE_AVAILABLE and config.PINECONE_API_KEY:
             try:
@@ -40,7 +43,6 @@ class LongTermMemory:
                 print(f"Warning: Could not initialize Pinecone: {e}")
         else:
             print("Warning: Pinecone not available. Long-term memory will use local storage.")
-            self.local_memory: Dict[str, Any] = {}
     
     def _initialize_pinecone(self) -> None:
         """Initialize Pinecone connection and index."""
@@ -85,24 +87,49 @@ class LongTermMemory:
             **metadata
         }
         
+        self._store_entry(memory_id, content, storage_metadata, embedding)
+        
+        return memory_id
+    
+    def embed_batch(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """
+        Embed several texts with a single embeddings request.
+        Returns None when embeddings would not be used (no Pinecone index) or cannot be generated.
+        """
+        if not self.initialized or not texts or not config.OPENAI_API_KEY:
+            return None
+        
+        try:
+            if self.embeddings is None:
+                from langchain_openai import OpenAIEmbeddings
+                self.embeddings = OpenAIEmbeddings(
+                    model=config.EMBEDDING_MODEL,
+                    api_key=config.OPENAI_API_KEY
+                )
+            return self.embeddings.embed_documents(texts)
+        except Exception as e:
+            print(f"Error generating embeddings: {e}")
+            return None
+    
+    def _store_entry(self, memory_id: str, content: str, metadata: Dict[str, Any], embedding: Optional[List[float]] = None) -> None:
+        """Store an entry in Pinecone when an embedding is available, otherwise locally."""
         if self.initialized and embedding:
             try:
-                # Store in Pinecone
+                # Pinecone rejects null metadata values
+                vector_metadata = {k: v for k, v in metadata.items() if v is not None}
+                vector_metadata.setdefault("content", content)
                 self.index.upsert(
-                    vectors=[(memory_id, embedding, storage_metadata)]
+                    vectors=[(memory_id, embedding, vector_metadata)]
                 )
-                print(f"Stored research finding in Pinecone: {memory_id}")
+                print(f"Stored {metadata.get('type', 'entry')} in Pinecone: {memory_id}")
+                return
             except Exception as e:
                 print(f"Error storing in Pinecone: {e}")
-                # Fallback to local storage
-                self._store_locally(memory_id, content, storage_metadata)
-        else:
-            # Store locally
-            self._store_locally(memory_id, content, storage_metadata)
         
-        return memory_id
+        # Local storage (also the fallback when Pinecone fails)
+        self._store_locally(memory_id, content, metadata)
     
-    def store_citation(self, citation: Citation) -> str:
+    def store_citation(self, citation: Citation, embedding: Optional[List[float]] = None) -> str:
         """Store a citation in long-term memory."""
         citation_id = f"citation_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{citation.title[:20].replace(' ', '_')}"
         
@@ -117,21 +144,26 @@ class LongTermMemory:
             "timestamp": datetime.now().isoformat()
         }
         
-        content = f"Citation: {citation.title}\nSnippet: {citation.snippet}"
-        
-        if self.initialized:
-            try:
-                # For citations, we don't need embeddings as they're primarily metadata
-                self._store_locally(citation_id, content, metadata)
-            except Exception as e:
-                print(f"Error storing citation: {e}")
-        else:
-            self._store_locally(citation_id, content, metadata)
+        content = self._citation_content(citation)
+        self._store_entry(citation_id, content, metadata, embedding)
         
         return citation_id
     
-    def store_research_report(self, report: ResearchReport) -> str:
-        """Store a complete research report."""
+    def _citation_content(self, citation: Citation) -> str:
+        """Text stored (and embedded) for a citation."""
+        return f"Citation: {citation.title}\nSnippet: {citation.snippet}"
+    
+    def store_citations(self, citations: List[Citation]) -> List[str]:
+        """Store several citations, embedding them all in one request."""
+        embeddings = self.embed_batch([self._citation_content(c) for c in citations]) or [None] * len(citations)
+        return [self.store_citation(c, embedding) for c, embedding in zip(citations, embeddings)]
+    
+    def store_research_report(self, report: ResearchReport, include_citations: bool = True) -> str:
+        """
+        Store a complete research report.
+        The report body and its citations are embedded in a single request.
+        Pass include_citations=False when the report's citations were already stored.
+        """
         report_id = f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{report.query[:20].replace(' ', '_')}"
         
         metadata = {
@@ -158,20 +190,17 @@ class LongTermMemory:
         {report.conclusions}
         
         Methodology: {report.methodology}
-        """
+        """.strip()
         
-        if self.initialized:
-            try:
-                self._store_locally(report_id, content.strip(), metadata)
-                
-                # Also store citations from the report
-                for citation in report.citations:
-                    self.store_citation(citation)
-                    
-            except Exception as e:
-                print(f"Error storing research report: {e}")
-        else:
-            self._store_locally(report_id, content.strip(), metadata)
+        citations = report.citations if include_citations else []
+        texts = [content] + [self._citation_content(c) for c in citations]
+        embeddings = self.embed_batch(texts) or [None] * len(texts)
+        
+        self._store_entry(report_id, content, metadata, embeddings[0])
+        
+        # Also store citations from the report
+        for citation, embedding in zip(citations, embeddings[1:]):
+            self.store_citation(citation, embedding)
         
         return report_id
     
@@ -218,15 +247,12 @@ class LongTermMemory:
         
         # Local storage stats
         return {
-            "local_entries": len(self.local_memory) if hasattr(self, 'local_memory') else 0,
+            "local_entries": len(self.local_memory),
             "backend": "local"
         }
     
     def _store_locally(self, memory_id: str, content: str, metadata: Dict[str, Any]) -> None:
         """Store memory entry locally as fallback."""
-        if not hasattr(self, 'local_memory'):
-            self.local_memory = {}
-        
         self.local_memory[memory_id] = {
             "content": content,
             "metadata": metadata
@@ -234,9 +260,6 @@ class LongTermMemory:
     
     def _search_locally(self, query: str, memory_type: Optional[str] = None, limit: int = 5) -> List[Dict[str, Any]]:
         """Search local memory storage."""
-        if not hasattr(self, 'local_memory'):
-            return []
-        
         results = []
         query_lower = query.lower()
         
@@ -248,16 +271,21 @@ class LongTermMemory:
             if memory_type and metadata.get("type") != memory_type:
                 continue
             
-            # Simple text matching
-            if not query or query_lower in content.lower():
-                score = 1.0 if not query else content.lower().count(query_lower) / len(content)
-                
-                results.append({
-                    "id": memory_id,
-                    "content": content,
-                    "metadata": metadata,
-                    "score": score
-                })
+            # Simple text matching (lowercase the content once per entry)
+            if query:
+                matches = content.lower().count(query_lower)
+                if not matches:
+                    continue
+                score = matches / len(content)
+            else:
+                score = 1.0
+            
+            results.append({
+                "id": memory_id,
+                "content": content,
+                "metadata": metadata,
+                "score": score
+            })
         
         # Sort by score and timestamp
         results.sort(key=lambda x: (x["score"], x["metadata"].get("timestamp", "")), reverse=True)
@@ -310,13 +338,12 @@ class LongTermMemory:
                 "memories": []
             }
             
-            if hasattr(self, 'local_memory'):
-                for memory_id, data in self.local_memory.items():
-                    export_data["memories"].append({
-                        "id": memory_id,
-                        "content": data["content"],
-                        "metadata": data["metadata"]
-                    })
+            for memory_id, data in self.local_memory.items():
+                export_data["memories"].append({
+                    "id": memory_id,
+                    "content": data["content"],
+                    "metadata": data["metadata"]
+                })
             
             with open(file_path, 'w', encoding='utf-8') as f:
                 json.dump(export_data, f, indent=2, ensure_ascii=False)
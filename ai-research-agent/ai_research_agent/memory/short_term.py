@@ -3,9 +3,9 @@ File: src/memory/short_term.py
 Purpose: Short-term working memory management for maintaining context during research sessions
 Functionality: Stores conversation history, current plan, and working context with size limits and retrieval
 Update Trigger: When memory management strategies change, context window limits are updated, or retrieval logic is modified
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
 import uuid
 
@@ -24,25 +24,30 @@ class ShortTermMemory:
         self.entries: List[MemoryEntry] = []
         self.current_plan: Optional[ResearchPlan] = None
         self.context_summary: str = ""
+        # Bumped on every mutation so callers can cache derived views
+        self.version: int = 0
         
     def add_entry(self, content: str, entry_type: str, importance: float = 0.5, metadata: Optional[Dict[str, Any]] = None) -> str:
         """Add a new memory entry."""
-        entry_id = str(uuid.uuid4())
-        
-        entry = MemoryEntry(
-            id=entry_id,
-            content=content,
-            entry_type=entry_type,
-            importance=importance,
-            metadata=metadata or {}
-        )
+        entry = self._build_entry(content, entry_type, importance, metadata)
         
         self.entries.append(entry)
+        self.version += 1
         
         # Maintain size limits
         self._manage_memory_size()
         
-        return entry_id
+        return entry.id
+    
+    def _build_entry(self, content: str, entry_type: str, importance: float, metadata: Optional[Dict[str, Any]]) -> MemoryEntry:
+        """Create a memory entry with a fresh unique id."""
+        return MemoryEntry(
+            id=str(uuid.uuid4()),
+            content=content,
+            entry_type=entry_type,
+            importance=importance,
+            metadata=metadata or {}
+        )
     
     def add_conversation_message(self, role: str, message: str) -> str:
         """Add a conversation message to memory."""
@@ -55,21 +60,40 @@ class ShortTermMemory:
     
     def add_observation(self, observation: str, tool_result: Optional[ToolResult] = None) -> str:
         """Add an observation from tool execution."""
-        metadata = {}
-        if tool_result:
-            metadata = {
-                "tool_name": tool_result.tool_name,
-                "success": tool_result.success,
-                "execution_time": tool_result.execution_time
-            }
-        
         return self.add_entry(
             content=observation,
             entry_type="observation",
             importance=0.8,
-            metadata=metadata
+            metadata=self._observation_metadata(tool_result)
         )
     
+    def add_observations(self, observations: List[Tuple[str, Optional[ToolResult]]]) -> List[str]:
+        """
+        Add several observations at once.
+        Size limits are enforced once for the whole batch rather than per entry.
+        """
+        new_entries = [
+            self._build_entry(observation, "observation", 0.8, self._observation_metadata(tool_result))
+            for observation, tool_result in observations
+        ]
+        
+        if new_entries:
+            self.entries.extend(new_entries)
+            self.version += 1
+            self._manage_memory_size()
+        
+        return [entry.id for entry in new_entries]
+    
+    def _observation_metadata(self, tool_result: Optional[ToolResult]) -> Dict[str, Any]:
+        """Build observation metadata from a tool result."""
+        if not tool_result:
+            return {}
+        return {
+            "tool_name": tool_result.tool_name,
+            "success": tool_result.success,
+            "execution_time": tool_result.execution_time
+        }
+    
     def add_reasoning_step(self, thought: str, action: str, reasoning_type: str = "react") -> str:
         """Add a reasoning step to memory."""
         content = f"Thought: {thought}\nAction: {action}"
@@ -83,6 +107,7 @@ class ShortTermMemory:
     def update_plan(self, plan: ResearchPlan) -> None:
         """Update the current research plan."""
         self.current_plan = plan
+        self.version += 1
         
         # Add plan summary to memory
         plan_summary = f"Research plan created with {len(plan.steps)} steps for query: '{plan.query}'"
@@ -173,8 +198,8 @@ class ShortTermMemory:
             if query_lower in entry.content.lower():
                 results.append(entry)
         
-        # Sort by relevance (exact matches first, then by importance)
-        results.sort(key=lambda x: (query_lower not in x.content.lower(), -x.importance))
+        # Sort by importance (every result already contains the query)
+        results.sort(key=lambda x: -x.importance)
         
         return results
     
@@ -199,6 +224,7 @@ class ShortTermMemory:
     def clear_memory(self, preserve_plan: bool = True) -> None:
         """Clear all memory entries, optionally preserving the current plan."""
         self.entries.clear()
+        self.version += 1
         
         if not preserve_plan:
             self.current_plan = None
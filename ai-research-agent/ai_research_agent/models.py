@@ -3,13 +3,14 @@ File: src/models.py
 Purpose: Core data models and schemas for the AI Research Agent using Pydantic
 Functionality: Defines type-safe data structures for plans, research steps, memory, and agent state
 Update Trigger: When new data structures are needed, existing models require new fields, or validation rules change
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+import json
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, validator
 
 
 class AgentState(str, Enum):
@@ -38,6 +39,23 @@ class ToolResult(BaseModel):
     execution_time: float = Field(..., ge=0, description="Time taken to execute in seconds")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional tool metadata")
 
+    _text_cache: Optional[str] = PrivateAttr(default=None)
+
+    def as_text(self) -> str:
+        """Return the result as text (structured results as JSON), memoized per result."""
+        if isinstance(self.result, str):
+            return self.result
+        if self._text_cache is None:
+            try:
+                self._text_cache = json.dumps(self.result, default=str)
+            except (TypeError, ValueError):
+                self._text_cache = str(self.result)
+        return self._text_cache
+
+    def summary(self, max_chars: int = 1024) -> str:
+        """Return a truncated string form of the result for use in prompts."""
+        return self.as_text()[:max_chars]
+
 
 class ResearchStep(BaseModel):
     """Individual step in a research plan."""
@@ -102,9 +120,21 @@ class AgentContext(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now)
     last_updated: datetime = Field(default_factory=datetime.now)
     
+    # (timestamp, formatted) pair so repeated status polls skip isoformat()
+    _last_updated_iso: Optional[Tuple[datetime, str]] = PrivateAttr(default=None)
+    
     def update_timestamp(self) -> None:
         """Update the last_updated timestamp."""
         self.last_updated = datetime.now()
+    
+    @property
+    def last_updated_iso(self) -> str:
+        """ISO-formatted last_updated, recomputed only when the timestamp changes."""
+        cached = self._last_updated_iso
+        if cached is None or cached[0] is not self.last_updated:
+            cached = (self.last_updated, self.last_updated.isoformat())
+            self._last_updated_iso = cached
+        return cached[1]
 
 
 class Citation(BaseModel):
@@ -3,13 +3,78 @@ File: src/reasoning/__init__.py
 Purpose: Reasoning module initialization and unified reasoning interface
 Functionality: Exports reasoning engines and provides strategy selection for different types of tasks
 Update Trigger: When new reasoning strategies are added or reasoning selection logic is modified
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
+import re
+from functools import lru_cache
+from types import MappingProxyType
+
 from .react import ReActEngine
 from .tree_of_thoughts import TreeOfThoughtsEngine
 
 __all__ = ["ReActEngine", "TreeOfThoughtsEngine", "ReasoningManager"]
 
+# Use Tree of Thoughts for complex, open-ended problems
+TOT_INDICATORS = [
+    "analyze", "compare", "evaluate", "complex", "multiple",
+    "alternatives", "trade-offs", "pros and cons", "strategy",
+    "approach", "methodology", "framework", "comprehensive"
+]
+
+# Use ReAct for straightforward information gathering and tool-based tasks
+REACT_INDICATORS = [
+    "search", "find", "lookup", "get", "retrieve", "download",
+    "extract", "parse", "calculate", "convert", "translate"
+]
+
+COMPLEX_KEYWORDS = [
+    "analyze", "evaluate", "compare", "synthesize", "comprehensive",
+    "multi-faceted", "complex", "nuanced", "trade-offs"
+]
+
+def _keyword_pattern(keywords):
+    """Compile keywords into one alternation so a text is scanned once."""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+_TOT_RE = _keyword_pattern(TOT_INDICATORS)
+_REACT_RE = _keyword_pattern(REACT_INDICATORS)
+_COMPLEX_RE = _keyword_pattern(COMPLEX_KEYWORDS)
+
+def _count_keywords(pattern, text: str) -> int:
+    """Number of distinct keywords that occur (as substrings) in text."""
+    return len(set(pattern.findall(text)))
+
+def _complexity_level(complexity_score: int) -> str:
+    """Map a complexity score to its level."""
+    if complexity_score >= 3:
+        return "high"
+    elif complexity_score >= 1:
+        return "medium"
+    else:
+        return "low"
+
+@lru_cache(maxsize=256)
+def _analyze_task(task: str, long_context: bool) -> MappingProxyType:
+    """
+    Score a task for strategy selection and complexity in one pass.
+    Only the context length matters, so callers pass a flag instead of the context itself.
+    """
+    task_lower = task.lower()
+    long_task = len(task.split()) > 20
+    
+    # Long task descriptions and long contexts both suggest a complex problem
+    tot_score = _count_keywords(_TOT_RE, task_lower) + long_context + long_task
+    react_score = _count_keywords(_REACT_RE, task_lower)
+    complexity_score = _count_keywords(_COMPLEX_RE, task_lower) + long_context + long_task
+    
+    return MappingProxyType({
+        "tot_score": tot_score,
+        "react_score": react_score,
+        "complexity_score": complexity_score,
+        "complexity": _complexity_level(complexity_score),
+        "strategy": "tree_of_thoughts" if tot_score > react_score else "react"
+    })
+
 class ReasoningManager:
     """
     Unified reasoning management interface that coordinates different reasoning strategies.
@@ -43,33 +108,7 @@ class ReasoningManager:
         """
         Automatically select the best reasoning strategy based on task characteristics.
         """
-        task_lower = task.lower()
-        
-        # Use Tree of Thoughts for complex, open-ended problems
-        tot_indicators = [
-            "analyze", "compare", "evaluate", "complex", "multiple",
-            "alternatives", "trade-offs", "pros and cons", "strategy",
-            "approach", "methodology", "framework", "comprehensive"
-        ]
-        
-        # Use ReAct for straightforward information gathering and tool-based tasks
-        react_indicators = [
-            "search", "find", "lookup", "get", "retrieve", "download",
-            "extract", "parse", "calculate", "convert", "translate"
-        ]
-        
-        tot_score = sum(1 for indicator in tot_indicators if indicator in task_lower)
-        react_score = sum(1 for indicator in react_indicators if indicator in task_lower)
-        
-        # Consider context length as well
-        if len(context) > 1000:  # Long context suggests complex problem
-            tot_score += 1
-        
-        # Consider task length
-        if len(task.split()) > 20:  # Long task description suggests complexity
-            tot_score += 1
-        
-        return "tree_of_thoughts" if tot_score > react_score else "react"
+        return _analyze_task(task, len(context) > 1000)["strategy"]
     
     def _execute_react(self, task: str, context: str, **kwargs):
         """Execute ReAct reasoning."""
@@ -106,29 +145,7 @@ class ReasoningManager:
     
     def _assess_task_complexity(self, task: str, context: str) -> str:
         """Assess the complexity level of the task."""
-        complexity_score = 0
-        
-        # Task length
-        if len(task.split()) > 20:
-            complexity_score += 1
-        
-        # Context length
-        if len(context) > 1000:
-            complexity_score += 1
-        
-        # Complex keywords
-        complex_keywords = [
-            "analyze", "evaluate", "compare", "synthesize", "comprehensive",
-            "multi-faceted", "complex", "nuanced", "trade-offs"
-        ]
-        complexity_score += sum(1 for keyword in complex_keywords if keyword in task.lower())
-        
-        if complexity_score >= 3:
-            return "high"
-        elif complexity_score >= 1:
-            return "medium"
-        else:
-            return "low"
+        return _analyze_task(task, len(context) > 1000)["complexity"]
     
     def get_available_strategies(self) -> list:
         """Get list of available reasoning strategies."""
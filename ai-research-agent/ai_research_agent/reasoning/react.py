@@ -3,21 +3,15 @@ File: src/reasoning/react.py
 Purpose: ReAct (Reason+Act) framework implementation for grounded reasoning with external tool usage
 Functionality: Implements thought-action-observation loops, handles tool execution, and maintains reasoning transparency
 Update Trigger: When ReAct patterns change, tool integration is updated, or reasoning prompts are modified
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
 from typing import Any, Dict, List, Optional, Tuple
 import json
 import re
 from datetime import datetime
 
-try:
-    from langchain_openai import ChatOpenAI
-    from langchain_core.prompts import ChatPromptTemplate
-    LANGCHAIN_AVAILABLE = True
-except ImportError:
-    LANGCHAIN_AVAILABLE = False
-
 from ..config import config
+from ..llm_client import LANGCHAIN_AVAILABLE, get_llm
 from ..models import ToolResult, ReasoningStrategy
 from ..tools import tool_registry
 
@@ -34,11 +28,8 @@ class ReActEngine:
         
         if LANGCHAIN_AVAILABLE and config.OPENAI_API_KEY:
             try:
-                self.llm = ChatOpenAI(
-                    model=self.model_name,
-                    api_key=config.OPENAI_API_KEY,
-                    temperature=0.1  # Low temperature for more focused reasoning
-                )
+                # Low temperature for more focused reasoning
+                self.llm = get_llm("reasoning", temperature=0.1)
             except Exception as e:
                 print(f"Warning: Could not initialize LLM: {e}")
         else:
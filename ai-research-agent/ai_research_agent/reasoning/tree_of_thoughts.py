@@ -3,24 +3,78 @@ File: src/reasoning/tree_of_thoughts.py
 Purpose: Tree of Thoughts (ToT) framework implementation for complex multi-path reasoning
 Functionality: Explores multiple reasoning paths, evaluates thought quality, and selects optimal solutions
 Update Trigger: When ToT algorithms change, evaluation criteria are updated, or search strategies are modified
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import json
+import re
+import threading
 from datetime import datetime
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 import heapq
 
-try:
-    from langchain_openai import ChatOpenAI
-    LANGCHAIN_AVAILABLE = True
-except ImportError:
-    LANGCHAIN_AVAILABLE = False
-
 from ..config import config
+from ..llm_client import LANGCHAIN_AVAILABLE, get_llm
 from ..models import ReasoningStrategy
 
-@dataclass
+# First score-like number in an evaluation response
+_SCORE_RE = re.compile(r'0?\.\d+|1\.0|0')
+
+# "THOUGHTn: ..." lines in a thought generation response
+_THOUGHT_RE = re.compile(r'^THOUGHT[^:\n]*:(.*)$', re.MULTILINE)
+
+# Solution-oriented wording, matched case-insensitively anywhere in a thought
+_SOLUTION_RE = re.compile(
+    r'solution|answer|conclusion|result|therefore|in summary|final|complete|solved',
+    re.IGNORECASE
+)
+_PRESCORE_RE = re.compile(r'solution|answer|conclusion|result', re.IGNORECASE)
+
+# Prompts are split into a system prefix that is identical for every call on the same
+# problem and a short per-thought suffix, so provider-side prefix caching can reuse
+# the prefix across sibling generations and evaluations.
+_GENERATION_PREFIX_TEMPLATE = """You are exploring different approaches to solve this problem using Tree of Thoughts reasoning.
+
+Given the current reasoning path and current thought, generate 2-3 distinct next thoughts that could help solve this problem. Each thought should:
+1. Be a logical next step from the current thought
+2. Explore a different angle or approach
+3. Be specific and actionable
+
+Format your response as:
+THOUGHT1: [your first thought]
+THOUGHT2: [your second thought]
+THOUGHT3: [your third thought] (optional)
+
+Problem: {problem}
+Context: {context}"""
+
+_EVALUATION_PREFIX_TEMPLATE = """Evaluate the quality of a thought for solving the given problem.
+
+Rate the thought on a scale of 0.0 to 1.0 based on:
+- Relevance to the problem (0-0.3)
+- Logical reasoning quality (0-0.3)
+- Potential to lead to a solution (0-0.4)
+
+Provide only a single number between 0.0 and 1.0.
+
+Problem: {problem}
+Context: {context}"""
+
+@lru_cache(maxsize=32)
+def _generation_prefix(problem: str, context: str) -> str:
+    """Stable system prompt for thought generation on a problem."""
+    return _GENERATION_PREFIX_TEMPLATE.format(problem=problem, context=context)
+
+@lru_cache(maxsize=32)
+def _evaluation_prefix(problem: str, context: str) -> str:
+    """Stable system prompt for thought evaluation on a problem."""
+    return _EVALUATION_PREFIX_TEMPLATE.format(problem=problem, context=context)
+
+@dataclass(slots=True)
 class ThoughtNode:
     """Represents a single thought in the reasoning tree."""
     id: str
@@ -31,6 +85,8 @@ class ThoughtNode:
     state: str  # "pending", "evaluated", "expanded", "terminal"
     children: List[str]
     metadata: Dict[str, Any]
+    # Reasoning path from the root to this node, filled in when the node joins the tree
+    path_cache: List[Dict[str, Any]] = field(default_factory=list)
 
 class TreeOfThoughtsEngine:
     """
@@ -43,27 +99,39 @@ class TreeOfThoughtsEngine:
         self.max_depth = 4  # Maximum depth of reasoning tree
         self.max_thoughts_per_level = 3  # Maximum thoughts to generate per level
         self.quality_threshold = 0.6  # Minimum quality score to continue
+        self.max_concurrency = config.TOT_MAX_CONCURRENCY  # Parallel LLM calls per tree level
         self.llm = None
         
+        # Exact-match LRU cache of LLM responses, keyed by prompt hash
+        self.prompt_cache_size = config.TOT_PROMPT_CACHE_SIZE
+        self._prompt_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._prompt_cache_lock = threading.Lock()
+        
         if LANGCHAIN_AVAILABLE and config.OPENAI_API_KEY:
             try:
-                self.llm = ChatOpenAI(
-                    model=self.model_name,
-                    api_key=config.OPENAI_API_KEY,
-                    temperature=0.7  # Higher temperature for diverse thoughts
-                )
+                # Higher temperature for diverse thoughts
+                self.llm = get_llm("reasoning", temperature=0.7)
             except Exception as e:
                 print(f"Warning: Could not initialize LLM: {e}")
         else:
             print("Warning: LangChain not available. ToT engine will use mock responses.")
     
-    def solve_problem(self, problem: str, context: str = "") -> Dict[str, Any]:
+    def solve_problem(self, problem: str, context: str = "", serialize_tree: bool = False) -> Dict[str, Any]:
         """
         Solve a complex problem using Tree of Thoughts reasoning.
+        The full thought tree is only included when serialize_tree is True.
         """
         # Initialize the reasoning tree
         thought_tree = {}
         solution_candidates = []
+        pruned_count = 0
+        
+        # Best thought that can no longer gain children, kept up to date as levels finish
+        best_leaf: Optional[ThoughtNode] = None
+        
+        # Quality scores of evaluated thoughts by normalized-content hash. Evaluation
+        # does not depend on a thought's position, so duplicates reuse the score.
+        evaluated_scores: Dict[str, float] = {}
         
         # Create root thought
         root_id = "root"
@@ -77,36 +145,70 @@ class TreeOfThoughtsEngine:
             children=[],
             metadata={"context": context}
         )
+        root_thought.path_cache = [self._path_entry(root_thought)]
         thought_tree[root_id] = root_thought
         
         # Breadth-first search through the thought space
         current_level = [root_id]
         
-        for depth in range(1, self.max_depth + 1):
-            next_level = []
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            # Sibling LLM calls at one level are independent, so dispatch them together.
+            # Without an LLM the mock calls are instant and run inline.
+            map_calls = pool.map if self.llm else map
             
-            for parent_id in current_level:
-                parent_thought = thought_tree[parent_id]
+            for depth in range(1, self.max_depth + 1):
+                next_level = []
+                parents = [thought_tree[parent_id] for parent_id in current_level]
                 
-                # Generate child thoughts
-                child_thoughts = self._generate_thoughts(
-                    parent_thought, problem, context, thought_tree
+                # Generate child thoughts for every parent at this level
+                children_per_parent = self._generate_thoughts_batch(
+                    parents, problem, context, thought_tree, map_calls
                 )
                 
-                # Evaluate each child thought
-                for child_thought in child_thoughts:
-                    child_id = f"thought_{len(thought_tree)}"
-                    child_thought.id = child_id
-                    child_thought.parent_id = parent_id
+                level_children = [
+                    (parent_thought, child_thought)
+                    for parent_thought, child_thoughts in zip(parents, children_per_parent)
+                    for child_thought in child_thoughts
+                ]
+                
+                # Drop obviously weak children with the cheap heuristic before paying
+                # for an LLM evaluation of each one
+                survivor_limit = 2 * self.max_thoughts_per_level
+                if len(level_children) > survivor_limit:
+                    prescores = [self._cheap_prescore(child) for _, child in level_children]
+                    keep = set(heapq.nlargest(
+                        survivor_limit, range(len(level_children)), key=prescores.__getitem__
+                    ))
+                    pruned_count += len(level_children) - len(keep)
+                    level_children = [pair for i, pair in enumerate(level_children) if i in keep]
+                
+                # Number children in parent order, as the tree will hold them
+                next_id = len(thought_tree)
+                for parent_thought, child_thought in level_children:
+                    child_thought.id = f"thought_{next_id}"
+                    child_thought.parent_id = parent_thought.id
                     child_thought.depth = depth
-                    
-                    # Evaluate thought quality
-                    quality_score = self._evaluate_thought(
-                        child_thought, problem, context, thought_tree
-                    )
+                    next_id += 1
+                
+                # Evaluate thought quality for the whole level, once per distinct thought
+                content_keys = [self._thought_key(child) for _, child in level_children]
+                to_evaluate = {}
+                for key, (_, child) in zip(content_keys, level_children):
+                    if key not in evaluated_scores and key not in to_evaluate:
+                        to_evaluate[key] = child
+                
+                new_scores = self._evaluate_thoughts_batch(
+                    list(to_evaluate.values()), problem, context, thought_tree, map_calls
+                )
+                evaluated_scores.update(zip(to_evaluate, new_scores))
+                quality_scores = [evaluated_scores[key] for key in content_keys]
+                
+                for (parent_thought, child_thought), quality_score in zip(level_children, quality_scores):
+                    child_id = child_thought.id
                     child_thought.quality_score = quality_score
                     
                     # Add to tree
+                    child_thought.path_cache = parent_thought.path_cache + [self._path_entry(child_thought)]
                     thought_tree[child_id] = child_thought
                     parent_thought.children.append(child_id)
                     
@@ -117,30 +219,77 @@ class TreeOfThoughtsEngine:
                     # Add to next level if quality is good enough
                     if quality_score >= self.quality_threshold and depth < self.max_depth:
                         next_level.append(child_id)
-            
-            # Prune: keep only the best thoughts for next level
-            if len(next_level) > self.max_thoughts_per_level:
-                next_level = self._select_best_thoughts(next_level, thought_tree)
-            
-            current_level = next_level
-            
-            # Early termination if we have good solutions
-            if len(solution_candidates) >= 2:
-                break
+                
+                # Prune: keep only the best thoughts for next level
+                if len(next_level) > self.max_thoughts_per_level:
+                    next_level = self._select_best_thoughts(next_level, thought_tree)
+                
+                # Everything not carried to the next level is now a final leaf:
+                # expanded parents that got no children and unselected children
+                selected = set(next_level)
+                for parent_thought in parents:
+                    if not parent_thought.children:
+                        best_leaf = self._better_leaf(best_leaf, parent_thought)
+                for _, child_thought in level_children:
+                    if child_thought.id not in selected:
+                        best_leaf = self._better_leaf(best_leaf, child_thought)
+                
+                current_level = next_level
+                
+                # Early termination if we have good solutions
+                if len(solution_candidates) >= 2:
+                    break
+        
+        # Thoughts left unexpanded by early termination are leaves too
+        for thought_id in current_level:
+            best_leaf = self._better_leaf(best_leaf, thought_tree[thought_id])
         
         # Select the best solution
         best_solution = self._select_best_solution(
-            solution_candidates, thought_tree, problem
+            solution_candidates, thought_tree, problem, best_leaf
         )
         
-        return {
+        result = {
             "problem": problem,
             "solution": best_solution,
-            "thought_tree": self._serialize_tree(thought_tree),
             "reasoning_strategy": ReasoningStrategy.TREE_OF_THOUGHTS,
             "total_thoughts": len(thought_tree),
-            "solution_candidates": len(solution_candidates)
+            "solution_candidates": len(solution_candidates),
+            "pruned_thoughts": pruned_count
         }
+        
+        if serialize_tree:
+            result["thought_tree"] = self._serialize_tree(thought_tree)
+        
+        return result
+    
+    def _generate_thoughts_batch(
+        self,
+        parents: List[ThoughtNode],
+        problem: str,
+        context: str,
+        thought_tree: Dict[str, ThoughtNode],
+        map_calls: Callable = map
+    ) -> List[List[ThoughtNode]]:
+        """Generate child thoughts for several parents, one list per parent."""
+        return list(map_calls(
+            lambda parent: self._generate_thoughts(parent, problem, context, thought_tree),
+            parents
+        ))
+    
+    def _evaluate_thoughts_batch(
+        self,
+        thoughts: List[ThoughtNode],
+        problem: str,
+        context: str,
+        thought_tree: Dict[str, ThoughtNode],
+        map_calls: Callable = map
+    ) -> List[float]:
+        """Evaluate several thoughts, returning scores in the same order."""
+        return list(map_calls(
+            lambda thought: self._evaluate_thought(thought, problem, context, thought_tree),
+            thoughts
+        ))
     
     def _generate_thoughts(
         self, 
@@ -162,11 +311,10 @@ class TreeOfThoughtsEngine:
             ]
         
         try:
-            prompt = self._create_thought_generation_prompt(
-                parent_thought, problem, context, thought_tree
+            suffix = self._create_thought_generation_prompt(parent_thought, thought_tree)
+            return self._parse_thought_response(
+                self._cached_invoke(_generation_prefix(problem, context), suffix)
             )
-            response = self.llm.invoke(prompt)
-            return self._parse_thought_response(response.content)
         except Exception as e:
             print(f"Error generating thoughts: {e}")
             return []
@@ -180,37 +328,68 @@ class TreeOfThoughtsEngine:
     ) -> float:
         """Evaluate the quality of a thought."""
         if not self.llm:
-            # Mock evaluation based on content length and keywords
-            content = thought.content.lower()
-            score = 0.5
-            
-            # Boost score for solution-oriented content
-            if any(word in content for word in ["solution", "answer", "conclusion", "result"]):
-                score += 0.2
-            
-            # Boost score for specific, detailed content
-            if len(content.split()) > 10:
-                score += 0.1
-            
-            return min(score, 1.0)
+            # Mock evaluation uses the heuristic score directly
+            return self._cheap_prescore(thought)
         
         try:
-            prompt = self._create_evaluation_prompt(thought, problem, context)
-            response = self.llm.invoke(prompt)
-            return self._parse_evaluation_response(response.content)
+            suffix = self._create_evaluation_prompt(thought)
+            return self._parse_evaluation_response(
+                self._cached_invoke(_evaluation_prefix(problem, context), suffix)
+            )
         except Exception as e:
             print(f"Error evaluating thought: {e}")
             return 0.5
     
+    def _thought_key(self, thought: ThoughtNode) -> str:
+        """Hash of the thought's normalized content (lowercase, collapsed whitespace, first 200 chars)."""
+        normalized = " ".join(thought.content.lower().split())[:200]
+        return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+    
+    def _cheap_prescore(self, thought: ThoughtNode) -> float:
+        """Heuristic quality score from content length and keywords (no LLM call)."""
+        content = thought.content
+        score = 0.5
+        
+        # Boost score for solution-oriented content
+        if _PRESCORE_RE.search(content):
+            score += 0.2
+        
+        # Boost score for specific, detailed content
+        if len(content.split()) > 10:
+            score += 0.1
+        
+        return min(score, 1.0)
+    
+    def _cached_invoke(self, prefix: str, suffix: str) -> str:
+        """
+        Invoke the LLM with the shared prefix as system message and the per-thought suffix last,
+        reusing the response for a prompt already sent with the same model settings.
+        """
+        key = hashlib.sha256(json.dumps({
+            "prefix": prefix,
+            "suffix": suffix,
+            "model": self.model_name,
+            "t": getattr(self.llm, "temperature", None)
+        }).encode()).hexdigest()
+        
+        with self._prompt_cache_lock:
+            cached = self._prompt_cache.get(key)
+            if cached is not None:
+                self._prompt_cache.move_to_end(key)
+                return cached
+        
+        content = self.llm.invoke([("system", prefix), ("human", suffix)]).content
+        
+        with self._prompt_cache_lock:
+            self._prompt_cache[key] = content
+            if len(self._prompt_cache) > self.prompt_cache_size:
+                self._prompt_cache.popitem(last=False)
+        
+        return content
+    
     def _is_solution_candidate(self, thought: ThoughtNode, problem: str) -> bool:
         """Check if a thought is a potential solution to the problem."""
-        content = thought.content.lower()
-        solution_indicators = [
-            "solution", "answer", "conclusion", "result", "therefore",
-            "in summary", "final", "complete", "solved"
-        ]
-        
-        return any(indicator in content for indicator in solution_indicators)
+        return _SOLUTION_RE.search(thought.content) is not None
     
     def _select_best_thoughts(
         self, 
@@ -218,28 +397,45 @@ class TreeOfThoughtsEngine:
         thought_tree: Dict[str, ThoughtNode]
     ) -> List[str]:
         """Select the best thoughts based on quality scores."""
-        scored_thoughts = [
-            (thought_tree[tid].quality_score, tid) for tid in thought_ids
-        ]
-        scored_thoughts.sort(reverse=True)
-        
-        return [tid for _, tid in scored_thoughts[:self.max_thoughts_per_level]]
+        # Ties are broken by thought id, as with the previous full sort
+        return heapq.nlargest(
+            self.max_thoughts_per_level,
+            thought_ids,
+            key=lambda tid: (thought_tree[tid].quality_score, tid)
+        )
+    
+    def _better_leaf(self, best: Optional[ThoughtNode], thought: ThoughtNode) -> Optional[ThoughtNode]:
+        """
+        Return the higher quality of two leaves (the root never counts).
+        Ties go to the thought created first, matching a scan of the tree in insertion order.
+        """
+        if thought.depth == 0:
+            return best
+        if best is None or thought.quality_score > best.quality_score:
+            return thought
+        if thought.quality_score == best.quality_score and self._thought_number(thought) < self._thought_number(best):
+            return thought
+        return best
+    
+    @staticmethod
+    def _thought_number(thought: ThoughtNode) -> int:
+        """Creation order of a non-root thought, from its "thought_<n>" id."""
+        return int(thought.id.rsplit("_", 1)[1])
     
     def _select_best_solution(
         self,
         solution_candidates: List[str],
         thought_tree: Dict[str, ThoughtNode],
-        problem: str
+        problem: str,
+        best_leaf: Optional[ThoughtNode] = None
     ) -> Dict[str, Any]:
-        """Select the best solution from candidates."""
+        """
+        Select the best solution from candidates.
+        best_leaf is the highest quality leaf node, tracked by solve_problem while building the tree.
+        """
         if not solution_candidates:
             # No explicit solutions found, use the highest quality leaf node
-            leaf_nodes = [
-                thought for thought in thought_tree.values()
-                if not thought.children and thought.depth > 0
-            ]
-            if leaf_nodes:
-                best_leaf = max(leaf_nodes, key=lambda t: t.quality_score)
+            if best_leaf is not None:
                 return {
                     "content": best_leaf.content,
                     "quality_score": best_leaf.quality_score,
@@ -274,20 +470,17 @@ class TreeOfThoughtsEngine:
         thought_tree: Dict[str, ThoughtNode]
     ) -> List[Dict[str, Any]]:
         """Get the reasoning path from root to a given thought."""
-        path = []
-        current_id = thought_id
-        
-        while current_id and current_id in thought_tree:
-            thought = thought_tree[current_id]
-            path.append({
-                "id": thought.id,
-                "content": thought.content,
-                "depth": thought.depth,
-                "quality_score": thought.quality_score
-            })
-            current_id = thought.parent_id
-        
-        return list(reversed(path))
+        thought = thought_tree.get(thought_id)
+        return thought.path_cache if thought else []
+    
+    def _path_entry(self, thought: ThoughtNode) -> Dict[str, Any]:
+        """Reasoning path entry for a single (already evaluated) thought."""
+        return {
+            "id": thought.id,
+            "content": thought.content,
+            "depth": thought.depth,
+            "quality_score": thought.quality_score
+        }
     
     def _serialize_tree(self, thought_tree: Dict[str, ThoughtNode]) -> Dict[str, Any]:
         """Serialize the thought tree for output."""
@@ -306,56 +499,23 @@ class TreeOfThoughtsEngine:
     def _create_thought_generation_prompt(
         self,
         parent_thought: ThoughtNode,
-        problem: str,
-        context: str,
         thought_tree: Dict[str, ThoughtNode]
     ) -> str:
-        """Create prompt for generating new thoughts."""
+        """Create the per-parent part of the thought generation prompt."""
         reasoning_path = self._get_reasoning_path(parent_thought.id, thought_tree)
         path_text = " -> ".join([step["content"][:50] + "..." for step in reasoning_path])
         
-        prompt = f"""You are exploring different approaches to solve this problem using Tree of Thoughts reasoning.
-
-Problem: {problem}
-Context: {context}
-
-Current reasoning path: {path_text}
+        prompt = f"""Current reasoning path: {path_text}
 
 Current thought: {parent_thought.content}
 
-Generate 2-3 distinct next thoughts that could help solve this problem. Each thought should:
-1. Be a logical next step from the current thought
-2. Explore a different angle or approach
-3. Be specific and actionable
-
-Format your response as:
-THOUGHT1: [your first thought]
-THOUGHT2: [your second thought]
-THOUGHT3: [your third thought] (optional)
-
 Your thoughts:"""
         
         return prompt
     
-    def _create_evaluation_prompt(
-        self,
-        thought: ThoughtNode,
-        problem: str,
-        context: str
-    ) -> str:
-        """Create prompt for evaluating thought quality."""
-        prompt = f"""Evaluate the quality of this thought for solving the given problem.
-
-Problem: {problem}
-Context: {context}
-Thought to evaluate: {thought.content}
-
-Rate this thought on a scale of 0.0 to 1.0 based on:
-- Relevance to the problem (0-0.3)
-- Logical reasoning quality (0-0.3)
-- Potential to lead to a solution (0-0.4)
-
-Provide only a single number between 0.0 and 1.0.
+    def _create_evaluation_prompt(self, thought: ThoughtNode) -> str:
+        """Create the per-thought part of the evaluation prompt."""
+        prompt = f"""Thought to evaluate: {thought.content}
 
 Quality score:"""
         
@@ -364,32 +524,23 @@ Quality score:"""
     def _parse_thought_response(self, response: str) -> List[ThoughtNode]:
         """Parse LLM response into thought nodes."""
         thoughts = []
-        lines = response.strip().split('\n')
-        
-        for line in lines:
-            if line.startswith('THOUGHT'):
-                # Extract thought content
-                if ':' in line:
-                    content = line.split(':', 1)[1].strip()
-                    if content:
-                        thoughts.append(ThoughtNode(
-                            id="", content=content, parent_id="", depth=0,
-                            quality_score=0.0, state="pending", children=[], metadata={}
-                        ))
+        
+        for match in _THOUGHT_RE.finditer(response.strip()):
+            content = match.group(1).strip()
+            if content:
+                thoughts.append(ThoughtNode(
+                    id="", content=content, parent_id="", depth=0,
+                    quality_score=0.0, state="pending", children=[], metadata={}
+                ))
         
         return thoughts
     
     def _parse_evaluation_response(self, response: str) -> float:
         """Parse evaluation response to extract quality score."""
-        try:
-            # Look for a number in the response
-            import re
-            numbers = re.findall(r'0?\.\d+|1\.0|0', response)
-            if numbers:
-                score = float(numbers[0])
-                return max(0.0, min(1.0, score))  # Clamp to [0, 1]
-        except ValueError:
-            pass
+        # Look for a number in the response
+        match = _SCORE_RE.search(response)
+        if match:
+            return max(0.0, min(1.0, float(match.group())))  # Clamp to [0, 1]
         
         return 0.5  # Default score if parsing fails
     
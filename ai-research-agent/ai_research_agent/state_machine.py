@@ -3,16 +3,29 @@ File: src/state_machine.py
 Purpose: Finite State Machine implementation for managing agent lifecycle and state transitions
 Functionality: Defines valid state transitions, handles state validation, and provides observable agent behavior
 Update Trigger: When new states are added, transition rules change, or state validation logic is modified
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
-from typing import Dict, List, Optional, Set
+from typing import Deque, Dict, FrozenSet, List, Optional, Set
+from collections import deque
 from enum import Enum
+from datetime import datetime
+import logging
+import queue
+import threading
 
+from .config import config
 from .models import AgentState, AgentContext
 
+logger = logging.getLogger(__name__)
+
+# One bit per state (by declaration order) for the transition bitmasks
+_STATE_BITS: Dict[AgentState, int] = {state: 1 << i for i, state in enumerate(AgentState)}
+
 class StateTransition:
     """Represents a valid state transition with optional conditions."""
     
+    __slots__ = ("from_state", "to_state", "condition")
+    
     def __init__(self, from_state: AgentState, to_state: AgentState, condition: Optional[str] = None):
         self.from_state = from_state
         self.to_state = to_state
@@ -30,7 +43,23 @@ class ResearchAgentStateMachine:
     
     def __init__(self):
         self.valid_transitions = self._define_transitions()
-        self.transition_history: List[AgentState] = []
+        
+        # Bitmask of allowed target states per source state, and read-only views of the same
+        self._transition_masks: Dict[AgentState, int] = {
+            from_state: sum(_STATE_BITS[to_state] for to_state in to_states)
+            for from_state, to_states in self.valid_transitions.items()
+        }
+        self._frozen_transitions: Dict[AgentState, FrozenSet[AgentState]] = {
+            from_state: frozenset(to_states)
+            for from_state, to_states in self.valid_transitions.items()
+        }
+        # Bounded so long-running agents don't accumulate history indefinitely
+        self.transition_history: Deque[AgentState] = deque(maxlen=config.MAX_TRANSITION_HISTORY)
+        
+        # Audit records are written by a background thread so transitions never block on I/O
+        self._audit_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._audit_thread: Optional[threading.Thread] = None
+        self._audit_lock = threading.Lock()
         
     def _define_transitions(self) -> Dict[AgentState, Set[AgentState]]:
         """Define all valid state transitions."""
@@ -74,7 +103,7 @@ class ResearchAgentStateMachine:
     
     def can_transition(self, from_state: AgentState, to_state: AgentState) -> bool:
         """Check if a state transition is valid."""
-        return to_state in self.valid_transitions.get(from_state, set())
+        return bool(self._transition_masks.get(from_state, 0) & _STATE_BITS[to_state])
     
     def transition(self, context: AgentContext, new_state: AgentState, reason: str = "") -> bool:
         """
@@ -90,25 +119,55 @@ class ResearchAgentStateMachine:
                 f"Valid transitions from {current_state}: {self.valid_transitions.get(current_state, set())}"
             )
         
-        # Record transition
-        self.transition_history.append(new_state)
+        self.transition_sync(context, new_state)
+        self._enqueue_audit((datetime.now(), current_state, new_state, reason))
         
-        # Update context
-        old_state = context.state
+        return True
+    
+    def transition_sync(self, context: AgentContext, new_state: AgentState) -> None:
+        """Apply a transition in memory only: record it and update the context."""
+        self.transition_history.append(new_state)
         context.state = new_state
         context.update_timestamp()
+    
+    def flush_audit(self, timeout: Optional[float] = 5.0) -> bool:
+        """Block until every queued audit record has been written."""
+        if self._audit_thread is None:
+            return True
         
-        print(f"State transition: {old_state} -> {new_state}" + (f" ({reason})" if reason else ""))
-        
-        return True
+        done = threading.Event()
+        self._audit_queue.put(done)
+        return done.wait(timeout)
+    
+    def _enqueue_audit(self, record) -> None:
+        """Hand an audit record to the writer thread, starting it on first use."""
+        if self._audit_thread is None:
+            with self._audit_lock:
+                if self._audit_thread is None:
+                    self._audit_thread = threading.Thread(
+                        target=self._audit_worker, name="state-audit", daemon=True
+                    )
+                    self._audit_thread.start()
+        self._audit_queue.put(record)
+    
+    def _audit_worker(self) -> None:
+        """Write queued audit records; threading.Event items mark flush points."""
+        while True:
+            record = self._audit_queue.get()
+            if isinstance(record, threading.Event):
+                record.set()
+                continue
+            
+            _, old_state, new_state, reason = record
+            logger.info("State transition: %s -> %s%s", old_state, new_state, f" ({reason})" if reason else "")
     
-    def get_valid_transitions(self, current_state: AgentState) -> Set[AgentState]:
+    def get_valid_transitions(self, current_state: AgentState) -> FrozenSet[AgentState]:
         """Get all valid transitions from the current state."""
-        return self.valid_transitions.get(current_state, set())
+        return self._frozen_transitions.get(current_state, frozenset())
     
     def get_transition_history(self) -> List[AgentState]:
         """Get the history of state transitions."""
-        return self.transition_history.copy()
+        return list(self.transition_history)
     
     def reset(self) -> None:
         """Reset the state machine to initial state."""
@@ -3,11 +3,13 @@ File: src/tools/__init__.py
 Purpose: Tool registry implementing the "Control Plane as a Tool" pattern for centralized tool management
 Functionality: Provides unified interface for tool discovery, execution, and management with proper error handling
 Update Trigger: When new tools are added, tool interfaces change, or execution policies are modified
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
 import time
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from ..config import config
 from ..models import ToolResult, ToolSchema
 from .web_search import WebSearchTool
 from .pdf_parser import PDFParserTool
@@ -21,6 +23,12 @@ class ToolRegistry:
     
     def __init__(self):
         self._tools: Dict[str, Any] = {}
+        # (validator, executor) callables resolved once per tool at registration
+        self._bindings: Dict[str, Tuple[Optional[Callable[..., Any]], Callable[..., Any]]] = {}
+        self._names_tuple: Tuple[str, ...] = ()
+        # Discovery results only change on register/unregister, so build them once
+        self._schemas_cache: Optional[List[ToolSchema]] = None
+        self._info_cache: Optional[Dict[str, Dict[str, Any]]] = None
         self._initialize_tools()
         print(f"ToolRegistry initialized with {len(self._tools)} tools: {list(self._tools.keys())}")
     
@@ -36,26 +44,47 @@ class ToolRegistry:
             print(f"Warning: Error initializing some tools: {e}")
             # Initialize with minimal set of tools that work
             self._tools = {}
+        self._rebind_tools()
+    
+    @staticmethod
+    def _bind_tool(tool: Any) -> Tuple[Optional[Callable[..., Any]], Callable[..., Any]]:
+        """Resolve a tool's validator and executor so execution needs no attribute probing."""
+        validator = getattr(tool, "validate_input", None)
+        if hasattr(tool, "execute"):
+            executor = tool.execute
+        elif hasattr(tool, "run"):
+            executor = tool.run
+        else:
+            # Fallback for simple callable tools
+            executor = tool
+        return validator, executor
+    
+    def _rebind_tools(self) -> None:
+        """Rebuild bound callables and the name tuple from the current tool set."""
+        self._bindings = {name: self._bind_tool(tool) for name, tool in self._tools.items()}
+        self._names_tuple = tuple(self._tools)
     
     def get_tool_schemas(self) -> List[ToolSchema]:
         """Return schemas for all available tools."""
-        schemas = []
-        for tool_name, tool in self._tools.items():
-            if hasattr(tool, "get_schema"):
-                schemas.append(tool.get_schema())
-            else:
-                # Fallback schema for tools without explicit schema
-                schemas.append(ToolSchema(
-                    name=tool_name,
-                    description=f"Tool: {tool_name}",
-                    parameters={},
-                    required_parameters=[]
-                ))
-        return schemas
+        if self._schemas_cache is None:
+            schemas = []
+            for tool_name, tool in self._tools.items():
+                if hasattr(tool, "get_schema"):
+                    schemas.append(tool.get_schema())
+                else:
+                    # Fallback schema for tools without explicit schema
+                    schemas.append(ToolSchema(
+                        name=tool_name,
+                        description=f"Tool: {tool_name}",
+                        parameters={},
+                        required_parameters=[]
+                    ))
+            self._schemas_cache = schemas
+        return list(self._schemas_cache)
     
     def get_tool_names(self) -> List[str]:
         """Get list of available tool names."""
-        return list(self._tools.keys())
+        return list(self._names_tuple)
     
     def has_tool(self, tool_name: str) -> bool:
         """Check if a tool is available."""
@@ -66,7 +95,7 @@ class ToolRegistry:
         Execute a tool with the given parameters.
         This is the central control plane for all tool executions.
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         # Validate tool exists
         if not self.has_tool(tool_name):
@@ -74,20 +103,21 @@ class ToolRegistry:
                 tool_name=tool_name,
                 success=False,
                 result="",
-                error_message=f"Tool '{tool_name}' not found. Available tools: {self.get_tool_names()}",
+                error_message=f"Tool '{tool_name}' not found. Available tools: {list(self._names_tuple)}",
                 execution_time=0.0
             )
         
         try:
-            # Get tool instance
-            tool = self._tools[tool_name]
-            
             # Execute tool with input validation and policy checks
-            result = self._execute_with_safety(tool, **kwargs)
+            result = self._execute_with_safety(self._bindings[tool_name], **kwargs)
             
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             
-            return ToolResult(
+            # Only the tool's result can break the schema; when it is a str or dict every field
+            # is known-good, so skip pydantic validation. Anything else is validated (and
+            # rejected) as before, which turns it into an error result below.
+            build_result = ToolResult.model_construct if isinstance(result, (str, dict)) else ToolResult
+            return build_result(
                 tool_name=tool_name,
                 success=True,
                 result=result,
@@ -97,7 +127,7 @@ class ToolRegistry:
             )
             
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             error_msg = f"Error executing {tool_name}: {str(e)}"
             print(f"Tool execution error: {error_msg}")
             
@@ -110,30 +140,53 @@ class ToolRegistry:
                 metadata={"input_params": kwargs, "error_type": type(e).__name__}
             )
     
-    def _execute_with_safety(self, tool: Any, **kwargs) -> Any:
+    def execute_tools_batch(self, calls: List[Tuple[str, Dict[str, Any]]]) -> List[ToolResult]:
+        """
+        Execute several (tool_name, parameters) calls concurrently.
+        
+        Tool work is dominated by network and file I/O, so each call runs through
+        execute_tool() on a worker thread. Results are returned in the same order as calls.
+        """
+        if not calls:
+            return []
+        
+        if len(calls) == 1:
+            tool_name, params = calls[0]
+            return [self.execute_tool(tool_name, **params)]
+        
+        max_workers = min(len(calls), config.TOOL_MAX_CONCURRENCY)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(lambda call: self.execute_tool(call[0], **call[1]), calls))
+    
+    def _execute_with_safety(self, binding: Tuple[Optional[Callable[..., Any]], Callable[..., Any]], **kwargs) -> Any:
         """
-        Execute tool with safety checks and validation.
+        Execute a bound tool with safety checks and validation.
         In production, this would include policy enforcement, rate limiting, etc.
         """
+        validator, executor = binding
+        
         # Input validation
-        if hasattr(tool, "validate_input"):
-            tool.validate_input(**kwargs)
+        if validator is not None:
+            validator(**kwargs)
         
         # Execute the tool
-        if hasattr(tool, "execute"):
-            return tool.execute(**kwargs)
-        elif hasattr(tool, "run"):
-            return tool.run(**kwargs)
-        else:
-            # Fallback for simple callable tools
-            return tool(**kwargs)
+        return executor(**kwargs)
     
     def get_tool_info(self, tool_name: str) -> Optional[Dict[str, Any]]:
         """Get detailed information about a specific tool."""
-        if not self.has_tool(tool_name):
-            return None
-        
-        tool = self._tools[tool_name]
+        return self._get_info_cache().get(tool_name)
+    
+    def _get_info_cache(self) -> Dict[str, Dict[str, Any]]:
+        """Return the per-tool info dicts, building them on first use."""
+        if self._info_cache is None:
+            self._info_cache = {
+                tool_name: self._build_tool_info(tool_name, tool)
+                for tool_name, tool in self._tools.items()
+            }
+        return self._info_cache
+    
+    def _build_tool_info(self, tool_name: str, tool: Any) -> Dict[str, Any]:
+        """Build the information dict for a single tool."""
         info = {
             "name": tool_name,
             "type": type(tool).__name__,
@@ -152,23 +205,31 @@ class ToolRegistry:
     
     def list_tools(self) -> Dict[str, Dict[str, Any]]:
         """List all available tools with their information."""
-        return {
-            tool_name: self.get_tool_info(tool_name)
-            for tool_name in self.get_tool_names()
-        }
+        return dict(self._get_info_cache())
     
     def register_tool(self, name: str, tool: Any) -> None:
         """Register a new tool with the registry."""
         self._tools[name] = tool
+        self._bindings[name] = self._bind_tool(tool)
+        self._names_tuple = tuple(self._tools)
+        self._invalidate_caches()
         print(f"Registered new tool: {name}")
     
     def unregister_tool(self, name: str) -> bool:
         """Unregister a tool from the registry."""
         if name in self._tools:
             del self._tools[name]
+            del self._bindings[name]
+            self._names_tuple = tuple(self._tools)
+            self._invalidate_caches()
             print(f"Unregistered tool: {name}")
             return True
         return False
 
+    def _invalidate_caches(self) -> None:
+        """Drop cached discovery results after the tool set changes."""
+        self._schemas_cache = None
+        self._info_cache = None
+
 # Global tool registry instance
 tool_registry = ToolRegistry()
@@ -3,7 +3,7 @@ File: src/tools/data_analyzer.py
 Purpose: Data analysis tool for processing structured data, generating insights, and creating visualizations
 Functionality: Analyzes datasets, performs statistical analysis, generates charts, and provides data summaries
 Update Trigger: When new analysis methods are needed, visualization requirements change, or data formats are updated
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
 from typing import Any, Dict, List, Optional, Union
 import json
@@ -30,6 +30,48 @@ class DataAnalyzerTool:
     Supports CSV, JSON, and tabular data analysis with visualization capabilities.
     """
     
+    _SCHEMA = ToolSchema(
+        name="data_analyzer",
+        description="Analyze structured data and generate insights",
+        parameters={
+            "data_source": {
+                "type": "string",
+                "description": "Path to data file or raw data string"
+            },
+            "analysis_type": {
+                "type": "string",
+                "enum": ["summary", "correlation", "distribution", "trend", "comparison"],
+                "description": "Type of analysis to perform",
+                "default": "summary"
+            },
+            "data_format": {
+                "type": "string",
+                "enum": ["csv", "json", "xlsx", "tsv", "auto"],
+                "description": "Format of the input data",
+                "default": "auto"
+            },
+            "columns": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "Specific columns to analyze (optional)",
+                "default": []
+            },
+            "create_visualization": {
+                "type": "boolean",
+                "description": "Whether to create charts and graphs",
+                "default": True
+            },
+            "max_rows": {
+                "type": "integer",
+                "description": "Maximum number of rows to process",
+                "minimum": 1,
+                "maximum": 10000,
+                "default": 1000
+            }
+        },
+        required_parameters=["data_source"]
+    )
+    
     def __init__(self):
         self.description = "Analyze structured data, generate insights, and create visualizations"
         self.supported_formats = ["csv", "json", "xlsx", "tsv"]
@@ -39,47 +81,7 @@ class DataAnalyzerTool:
     
     def get_schema(self) -> ToolSchema:
         """Return the tool schema for the agent to understand how to use this tool."""
-        return ToolSchema(
-            name="data_analyzer",
-            description="Analyze structured data and generate insights",
-            parameters={
-                "data_source": {
-                    "type": "string",
-                    "description": "Path to data file or raw data string"
-                },
-                "analysis_type": {
-                    "type": "string",
-                    "enum": ["summary", "correlation", "distribution", "trend", "comparison"],
-                    "description": "Type of analysis to perform",
-                    "default": "summary"
-                },
-                "data_format": {
-                    "type": "string",
-                    "enum": ["csv", "json", "xlsx", "tsv", "auto"],
-                    "description": "Format of the input data",
-                    "default": "auto"
-                },
-                "columns": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "Specific columns to analyze (optional)",
-                    "default": []
-                },
-                "create_visualization": {
-                    "type": "boolean",
-                    "description": "Whether to create charts and graphs",
-                    "default": True
-                },
-                "max_rows": {
-                    "type": "integer",
-                    "description": "Maximum number of rows to process",
-                    "minimum": 1,
-                    "maximum": 10000,
-                    "default": 1000
-                }
-            },
-            required_parameters=["data_source"]
-        )
+        return self._SCHEMA
     
     def validate_input(self, data_source: str, **kwargs) -> None:
         """Validate input parameters."""
@@ -3,12 +3,14 @@ File: src/tools/pdf_parser.py
 Purpose: PDF document parsing tool for extracting text content from PDF files and URLs
 Functionality: Downloads PDFs, extracts text content, handles metadata extraction, and formats citations
 Update Trigger: When PDF parsing requirements change, new extraction features are needed, or citation formats are updated
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
 from typing import Any, Dict, List, Optional
 import requests
 import tempfile
+import mmap
 import os
+import logging
 from datetime import datetime
 from urllib.parse import urlparse, urljoin
 import re
@@ -22,14 +24,49 @@ except ImportError:
 from ..config import config
 from ..models import ToolSchema, Citation
 
+logger = logging.getLogger(__name__)
+
 class PDFParserTool:
     """
     PDF parsing tool for extracting text content from PDF documents.
     Supports both file paths and URLs.
     """
     
+    _SCHEMA = ToolSchema(
+        name="pdf_parser",
+        description="Extract text content from PDF documents",
+        parameters={
+            "source": {
+                "type": "string",
+                "description": "PDF file path or URL to parse"
+            },
+            "max_pages": {
+                "type": "integer",
+                "description": "Maximum number of pages to extract (default: 50)",
+                "minimum": 1,
+                "maximum": 200,
+                "default": 50
+            },
+            "extract_metadata": {
+                "type": "boolean",
+                "description": "Whether to extract PDF metadata",
+                "default": True
+            },
+            "page_range": {
+                "type": "object",
+                "properties": {
+                    "start": {"type": "integer", "minimum": 1},
+                    "end": {"type": "integer", "minimum": 1}
+                },
+                "description": "Specific page range to extract (optional)"
+            }
+        },
+        required_parameters=["source"]
+    )
+    
     def __init__(self):
         self.max_pages = config.PDF_MAX_PAGES
+        self.download_chunk_size = 64 * 1024
         self.description = "Extract text content from PDF documents via file path or URL"
         
         if not PYPDF_AVAILABLE:
@@ -37,37 +74,7 @@ class PDFParserTool:
     
     def get_schema(self) -> ToolSchema:
         """Return the tool schema for the agent to understand how to use this tool."""
-        return ToolSchema(
-            name="pdf_parser",
-            description="Extract text content from PDF documents",
-            parameters={
-                "source": {
-                    "type": "string",
-                    "description": "PDF file path or URL to parse"
-                },
-                "max_pages": {
-                    "type": "integer",
-                    "description": "Maximum number of pages to extract (default: 50)",
-                    "minimum": 1,
-                    "maximum": 200,
-                    "default": 50
-                },
-                "extract_metadata": {
-                    "type": "boolean",
-                    "description": "Whether to extract PDF metadata",
-                    "default": True
-                },
-                "page_range": {
-                    "type": "object",
-                    "properties": {
-                        "start": {"type": "integer", "minimum": 1},
-                        "end": {"type": "integer", "minimum": 1}
-                    },
-                    "description": "Specific page range to extract (optional)"
-                }
-            },
-            required_parameters=["source"]
-        )
+        return self._SCHEMA
     
     def validate_input(self, source: str, **kwargs) -> None:
         """Validate input parameters."""
@@ -155,20 +162,30 @@ class PDFParserTool:
     def _download_pdf(self, url: str) -> str:
         """Download PDF from URL to temporary file."""
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            
-            # Check if content is actually a PDF
-            content_type = response.headers.get("content-type", "").lower()
-            if "pdf" not in content_type and not url.lower().endswith(".pdf"):
-                # Try to detect PDF by content
-                if not response.content.startswith(b"%PDF"):
-                    raise ValueError("URL does not appear to contain a PDF document")
-            
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
-                temp_file.write(response.content)
-                return temp_file.name
+            # Stream the body straight to disk rather than buffering it in memory
+            with requests.get(url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                chunks = response.iter_content(chunk_size=self.download_chunk_size)
+                first_chunk = next(chunks, b"")
+                
+                # Check if content is actually a PDF
+                content_type = response.headers.get("content-type", "").lower()
+                if "pdf" not in content_type and not url.lower().endswith(".pdf"):
+                    # Try to detect PDF by content
+                    if not first_chunk.startswith(b"%PDF"):
+                        raise ValueError("URL does not appear to contain a PDF document")
+                
+                # Create temporary file
+                with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp_file:
+                    try:
+                        temp_file.write(first_chunk)
+                        for chunk in chunks:
+                            temp_file.write(chunk)
+                    except Exception:
+                        temp_file.close()
+                        os.unlink(temp_file.name)
+                        raise
+                    return temp_file.name
                 
         except requests.exceptions.RequestException as e:
             raise Exception(f"Failed to download PDF: {str(e)}")
@@ -178,72 +195,85 @@ class PDFParserTool:
     def _extract_pdf_content(self, pdf_path: str, **kwargs) -> Dict[str, Any]:
         """Extract text content and metadata from PDF."""
         try:
-            reader = PdfReader(pdf_path)
-            
-            # Extract metadata
-            metadata = {}
-            extract_metadata = kwargs.get("extract_metadata", True)
-            if extract_metadata and reader.metadata:
-                metadata = {
-                    "title": reader.metadata.get("/Title", ""),
-                    "author": reader.metadata.get("/Author", ""),
-                    "subject": reader.metadata.get("/Subject", ""),
-                    "creator": reader.metadata.get("/Creator", ""),
-                    "producer": reader.metadata.get("/Producer", ""),
-                    "creation_date": reader.metadata.get("/CreationDate", ""),
-                    "modification_date": reader.metadata.get("/ModDate", "")
-                }
-            
-            # Determine page range
-            total_pages = len(reader.pages)
-            max_pages = min(kwargs.get("max_pages", 50), total_pages)
-            
-            page_range = kwargs.get("page_range")
-            if page_range:
-                start_page = max(0, page_range.get("start", 1) - 1)  # Convert to 0-based
-                end_page = min(total_pages, page_range.get("end", total_pages))
-            else:
-                start_page = 0
-                end_page = min(max_pages, total_pages)
-            
-            # Extract text from pages
-            text_content = []
-            extracted_pages = []
-            
-            for page_num in range(start_page, end_page):
-                try:
-                    page = reader.pages[page_num]
-                    text = page.extract_text()
-                    
-                    if text.strip():  # Only add non-empty pages
-                        text_content.append(f"--- Page {page_num + 1} ---\n{text}\n")
-                        extracted_pages.append(page_num + 1)
-                
-                except Exception as e:
-                    print(f"Warning: Could not extract text from page {page_num + 1}: {e}")
-                    continue
-            
-            full_text = "\n".join(text_content)
-            
-            # Clean up text
-            cleaned_text = self._clean_text(full_text)
-            
-            return {
-                "content": cleaned_text,
-                "metadata": metadata,
-                "page_info": {
-                    "total_pages": total_pages,
-                    "extracted_pages": extracted_pages,
-                    "page_range_requested": f"{start_page + 1}-{end_page}"
-                },
-                "word_count": len(cleaned_text.split()),
-                "character_count": len(cleaned_text),
-                "extraction_time": datetime.now().isoformat()
-            }
+            # Memory-map the file so pypdf pages data in on demand instead of
+            # reading the whole document into a Python buffer first
+            with open(pdf_path, "rb") as pdf_file, \
+                    mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_READ) as pdf_map:
+                # strict=False tolerates minor xref damage instead of failing up front
+                reader = PdfReader(pdf_map, strict=False)
+                return self._extract_from_reader(reader, **kwargs)
             
         except Exception as e:
             raise Exception(f"Failed to extract PDF content: {str(e)}")
     
+    def _extract_from_reader(self, reader: Any, **kwargs) -> Dict[str, Any]:
+        """Extract text content and metadata from an open PdfReader."""
+        # Extract metadata
+        metadata = {}
+        extract_metadata = kwargs.get("extract_metadata", True)
+        if extract_metadata and reader.metadata:
+            metadata = {
+                "title": reader.metadata.get("/Title", ""),
+                "author": reader.metadata.get("/Author", ""),
+                "subject": reader.metadata.get("/Subject", ""),
+                "creator": reader.metadata.get("/Creator", ""),
+                "producer": reader.metadata.get("/Producer", ""),
+                "creation_date": reader.metadata.get("/CreationDate", ""),
+                "modification_date": reader.metadata.get("/ModDate", "")
+            }
+        
+        # Determine page range
+        total_pages = len(reader.pages)
+        max_pages = min(kwargs.get("max_pages", 50), total_pages)
+        
+        page_range = kwargs.get("page_range")
+        if page_range:
+            start_page = max(0, page_range.get("start", 1) - 1)  # Convert to 0-based
+            end_page = min(total_pages, page_range.get("end", total_pages))
+        else:
+            start_page = 0
+            end_page = max_pages
+        
+        # Extract text from pages
+        text_content = []
+        extracted_pages = []
+        failed_pages = []
+        
+        for page_num in range(start_page, end_page):
+            try:
+                page = reader.pages[page_num]
+                text = page.extract_text()
+                
+                if text.strip():  # Only add non-empty pages
+                    text_content.append(f"--- Page {page_num + 1} ---\n{text}\n")
+                    extracted_pages.append(page_num + 1)
+            
+            except Exception:
+                failed_pages.append(page_num + 1)
+                continue
+        
+        if failed_pages:
+            logger.warning("Failed to extract %d pages: %s", len(failed_pages), failed_pages)
+        
+        full_text = "\n".join(text_content)
+        
+        # Clean up text
+        cleaned_text = self._clean_text(full_text)
+        
+        return {
+            "content": cleaned_text,
+            "metadata": metadata,
+            "page_info": {
+                "total_pages": total_pages,
+                "extracted_pages": extracted_pages,
+                "failed_pages": failed_pages,
+                "page_range_requested": f"{start_page + 1}-{end_page}"
+            },
+            "word_count": len(cleaned_text.split()),
+            "character_count": len(cleaned_text),
+            "extraction_time": datetime.now().isoformat()
+        }
+    
     def _clean_text(self, text: str) -> str:
         """Clean extracted text content."""
         # Remove excessive whitespace
@@ -294,10 +324,10 @@ class PDFParserTool:
             if date_str.startswith("D:"):
                 date_str = date_str[2:]  # Remove D: prefix
             
-            # Extract just the date part (YYYYMMDD)
-            if len(date_str) >= 8:
-                date_part = date_str[:8]
-                return datetime.strptime(date_part, "%Y%m%d")
+            # Extract just the date part (YYYYMMDD); slicing avoids strptime's
+            # format parsing overhead
+            if len(date_str) >= 8 and date_str[:8].isdigit():
+                return datetime(int(date_str[0:4]), int(date_str[4:6]), int(date_str[6:8]))
             
             return None
         except Exception:
@@ -3,9 +3,10 @@ File: src/tools/web_search.py
 Purpose: Web search tool using Tavily API for retrieving relevant information from the internet
 Functionality: Performs web searches, extracts content, formats results with citations, and handles search optimization
 Update Trigger: When Tavily API changes, search parameters need adjustment, or result formatting requirements change
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
 from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from datetime import datetime
 
@@ -18,50 +19,53 @@ class WebSearchTool:
     Supports various search modes and result filtering.
     """
     
+    _SCHEMA = ToolSchema(
+        name="web_search",
+        description="Search the web for current information on any topic",
+        parameters={
+            "query": {
+                "type": "string",
+                "description": "Search query to find relevant information"
+            },
+            "search_depth": {
+                "type": "string",
+                "enum": ["basic", "advanced"],
+                "description": "Depth of search - basic for quick results, advanced for comprehensive research",
+                "default": "basic"
+            },
+            "max_results": {
+                "type": "integer",
+                "description": "Maximum number of results to return (1-20)",
+                "minimum": 1,
+                "maximum": 20,
+                "default": 5
+            },
+            "include_domains": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "List of domains to prioritize in search results",
+                "default": []
+            },
+            "exclude_domains": {
+                "type": "array",
+                "items": {"type": "string"},
+                "description": "List of domains to exclude from search results",
+                "default": []
+            }
+        },
+        required_parameters=["query"]
+    )
+    
     def __init__(self):
         self.api_key = config.TAVILY_API_KEY
         self.base_url = "https://api.tavily.com/search"
         self.max_results = config.WEB_SEARCH_MAX_RESULTS
+        self.max_batch_workers = config.WEB_SEARCH_MAX_CONCURRENCY
         self.description = "Search the web for information on any topic using Tavily API"
     
     def get_schema(self) -> ToolSchema:
         """Return the tool schema for the agent to understand how to use this tool."""
-        return ToolSchema(
-            name="web_search",
-            description="Search the web for current information on any topic",
-            parameters={
-                "query": {
-                    "type": "string",
-                    "description": "Search query to find relevant information"
-                },
-                "search_depth": {
-                    "type": "string",
-                    "enum": ["basic", "advanced"],
-                    "description": "Depth of search - basic for quick results, advanced for comprehensive research",
-                    "default": "basic"
-                },
-                "max_results": {
-                    "type": "integer",
-                    "description": "Maximum number of results to return (1-20)",
-                    "minimum": 1,
-                    "maximum": 20,
-                    "default": 5
-                },
-                "include_domains": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "List of domains to prioritize in search results",
-                    "default": []
-                },
-                "exclude_domains": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "description": "List of domains to exclude from search results",
-                    "default": []
-                }
-            },
-            required_parameters=["query"]
-        )
+        return self._SCHEMA
     
     def validate_input(self, query: str, **kwargs) -> None:
         """Validate input parameters."""
@@ -108,6 +112,23 @@ class WebSearchTool:
                 "citations": []
             }
     
+    def batch_execute(self, queries: List[str], **kwargs) -> List[Dict[str, Any]]:
+        """
+        Execute several web searches concurrently.
+        
+        Each query is run through execute() on a worker thread so the network
+        round-trips overlap. Results are returned in the same order as queries.
+        """
+        if not queries:
+            return []
+        
+        if len(queries) == 1:
+            return [self.execute(queries[0], **kwargs)]
+        
+        max_workers = min(len(queries), self.max_batch_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(lambda query: self.execute(query, **kwargs), queries))
+    
     def _prepare_search_params(self, query: str, **kwargs) -> Dict[str, Any]:
         """Prepare parameters for Tavily API request."""
         params = {
@@ -198,13 +219,13 @@ class WebSearchTool:
             return None
         
         try:
-            # Try common date formats
-            for fmt in ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M:%S.%f"]:
-                try:
-                    return datetime.strptime(date_str.split("T")[0], "%Y-%m-%d")
-                except ValueError:
-                    continue
-            return None
+            # Only the calendar date is kept, so parse the ISO date part directly
+            date_part = date_str.split("T")[0]
+            if len(date_part) != 10 or date_part[4] != "-" or date_part[7] != "-":
+                return None
+            if not (date_part[0:4].isdigit() and date_part[5:7].isdigit() and date_part[8:10].isdigit()):
+                return None
+            return datetime(int(date_part[0:4]), int(date_part[5:7]), int(date_part[8:10]))
         except Exception:
             return None
     
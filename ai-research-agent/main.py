@@ -3,15 +3,52 @@ File: main.py
 Purpose: Main entry point for the AI Research Agent with command line interface and example usage
 Functionality: Provides CLI interface, example research queries, and basic agent interaction
 Update Trigger: When CLI options change, new example queries are added, or user interface is modified
-Last Modified: 2024-06-24
+Last Modified: 2026-10-16
 """
+import io
 import sys
+import atexit
+import queue
+import logging
 import argparse
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
-from ai_research_agent.agent import research_agent
+from ai_research_agent.agent import get_research_agent
 from ai_research_agent.config import config
 
+RULE = "=" * 80
+HEADER = f"{RULE}\n🔬 AI RESEARCH AGENT\n{RULE}\n"
+RESULTS_HEADER = f"\n{RULE}\n📊 RESEARCH RESULTS\n{RULE}\n"
+
+# Listener installed by the first configure_logging() call
+_log_listener: Optional[QueueListener] = None
+
+def configure_logging(level: int = logging.INFO) -> QueueListener:
+    """
+    Route agent log records through a queue so that workflow steps only enqueue
+    records and a background listener does the console writes.
+    Safe to call repeatedly: later calls only update the level.
+    """
+    global _log_listener
+    agent_logger = logging.getLogger("ai_research_agent")
+    agent_logger.setLevel(level)
+    if _log_listener is not None:
+        return _log_listener
+    
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    console = logging.StreamHandler(sys.stderr)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    
+    listener = QueueListener(log_queue, console)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    agent_logger.addHandler(QueueHandler(log_queue))
+    agent_logger.propagate = False
+    _log_listener = listener
+    return listener
+
 def run_research(query: str, strategy: str = "decomposition_first", export_format: str = "markdown") -> None:
     """
     Run a research query and display results.
@@ -21,51 +58,54 @@ def run_research(query: str, strategy: str = "decomposition_first", export_forma
         strategy: Planning strategy to use
         export_format: Format for exporting results
     """
-    print("=" * 80)
-    print("🔬 AI RESEARCH AGENT")
-    print("=" * 80)
+    sys.stdout.write(HEADER)
+    sys.stdout.flush()
+    
+    research_agent = get_research_agent()
     
     try:
         # Run the research
         report = research_agent.research(query, strategy)
         
-        # Display results
-        print("\n" + "=" * 80)
-        print("📊 RESEARCH RESULTS")
-        print("=" * 80)
+        # Build the results display in memory and write it in one go
+        buf = io.StringIO()
+        out = buf.write
         
-        print(f"📄 **Executive Summary:**")
-        print(report.executive_summary)
-        print()
+        out(RESULTS_HEADER)
         
-        print(f"🔍 **Key Findings:**")
-        print(report.detailed_findings[:500] + "..." if len(report.detailed_findings) > 500 else report.detailed_findings)
-        print()
+        out("📄 **Executive Summary:**\n")
+        out(f"{report.executive_summary}\n\n")
         
-        print(f"💡 **Conclusions:**")
-        print(report.conclusions)
-        print()
+        out("🔍 **Key Findings:**\n")
+        findings = report.detailed_findings
+        out(f"{findings[:500] + '...' if len(findings) > 500 else findings}\n\n")
         
-        print(f"📚 **Citations:** {len(report.citations)} sources")
+        out("💡 **Conclusions:**\n")
+        out(f"{report.conclusions}\n\n")
+        
+        out(f"📚 **Citations:** {len(report.citations)} sources\n")
         for i, citation in enumerate(report.citations[:5], 1):
-            print(f"  {i}. {citation.title}")
+            out(f"  {i}. {citation.title}\n")
             if citation.source_url:
-                print(f"     {citation.source_url}")
+                out(f"     {citation.source_url}\n")
         
         if len(report.citations) > 5:
-            print(f"     ... and {len(report.citations) - 5} more sources")
+            out(f"     ... and {len(report.citations) - 5} more sources\n")
         
-        print(f"\n📈 **Report Statistics:**")
-        print(f"  - Word Count: {report.word_count}")
-        print(f"  - Generated: {report.generated_at.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"  - Methodology: {report.methodology[:100]}...")
+        out("\n📈 **Report Statistics:**\n")
+        out(f"  - Word Count: {report.word_count}\n")
+        out(f"  - Generated: {report.generated_at.strftime('%Y-%m-%d %H:%M:%S')}\n")
+        out(f"  - Methodology: {report.methodology[:100]}...\n")
         
         # Get execution summary
         summary = research_agent.get_execution_summary()
         if "total_steps" in summary:
-            print(f"  - Steps Executed: {summary['total_steps']}")
-            print(f"  - Success Rate: {summary['success_rate']:.1%}")
-            print(f"  - Total Time: {summary['total_execution_time']:.1f}s")
+            out(f"  - Steps Executed: {summary['total_steps']}\n")
+            out(f"  - Success Rate: {summary['success_rate']:.1%}\n")
+            out(f"  - Total Time: {summary['total_execution_time']:.1f}s\n")
+        
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
         
     except Exception as e:
         print(f"❌ Research failed: {e}")
@@ -76,6 +116,13 @@ def run_research(query: str, strategy: str = "decomposition_first", export_forma
 
 def run_interactive_mode() -> None:
     """Run the agent in interactive mode."""
+    try:
+        import readline  # noqa: F401 - enables input() history and line editing
+    except ImportError:
+        pass
+    
+    research_agent = get_research_agent()
+    
     print("🤖 AI Research Agent - Interactive Mode")
     print("Type 'quit' to exit, 'status' for agent status, 'help' for commands\n")
     
@@ -137,6 +184,22 @@ def run_examples() -> None:
             run_research(example)
             input("\nPress Enter to continue to next example...")
 
+def show_status() -> None:
+    """Print agent status."""
+    status = get_research_agent().get_status()
+    print("🤖 Agent Status:")
+    for key, value in status.items():
+        print(f"  {key}: {value}")
+
+# Run modes in priority order, keyed by the argparse attribute that selects them.
+# Each maps to its handler and the argparse attributes passed to it positionally.
+MODE_DISPATCH = {
+    "status": (show_status, ()),
+    "interactive": (run_interactive_mode, ()),
+    "examples": (run_examples, ()),
+    "query": (run_research, ("query", "strategy", "export")),
+}
+
 def main():
     """Main entry point with argument parsing."""
     parser = argparse.ArgumentParser(
@@ -190,34 +253,20 @@ Examples:
     )
     
     args = parser.parse_args()
+    configure_logging()
     
     # Check configuration
-    try:
-        config.validate_required_keys()
-    except ValueError as e:
-        print(f"⚠️  Configuration Warning: {e}")
+    config_warning = config.required_keys_error
+    if config_warning:
+        print(f"⚠️  Configuration Warning: {config_warning}")
         print("Some features may not work without proper API keys.")
         print("See .env.example for required environment variables.\n")
     
     # Handle different modes
-    if args.status:
-        status = research_agent.get_status()
-        print("🤖 Agent Status:")
-        for key, value in status.items():
-            print(f"  {key}: {value}")
-        return
-    
-    if args.interactive:
-        run_interactive_mode()
-        return
-    
-    if args.examples:
-        run_examples()
-        return
-    
-    if args.query:
-        run_research(args.query, args.strategy, args.export)
-        return
+    for mode, (handler, arg_names) in MODE_DISPATCH.items():
+        if getattr(args, mode):
+            handler(*(getattr(args, name) for name in arg_names))
+            return
     
     # No arguments provided, show help
     parser.print_help()